@@ -26,53 +26,35 @@ def main():
     db = Neo4jDatabase(NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD)
     print(f"✅ Neo4j 연결 성공: {NEO4J_URI}\n")
     
+    # 노드/관계/소스 파일 통계 (한 번의 round-trip)
+    overview = db.get_breakdown_stats(source_limit=None)
+    node_stats = overview['node_stats']
+    rel_stats = overview['rel_stats']
+    source_stats = overview['source_stats']
+    
     # 노드 타입별 통계
     print("📈 노드 타입별 개수:")
-    node_stats = db.execute_query("""
-        MATCH (n)
-        RETURN labels(n)[0] as type, count(n) as count
-        ORDER BY count DESC
-    """)
-    
-    total_nodes = 0
     if node_stats:
         for record in node_stats:
-            count = record['count']
-            total_nodes += count
-            print(f"   - {record['type']}: {count:,}")
+            print(f"   - {record['type']}: {record['count']:,}")
     else:
         print("   (노드 없음)")
     
-    print(f"\n   📊 총 노드 수: {total_nodes:,}")
+    # 라벨이 여러 개인 노드가 있으므로 라벨별 합 대신 총 개수를 따로 사용
+    print(f"\n   📊 총 노드 수: {overview['total_nodes']:,}")
     
     # 관계 타입별 통계
     print(f"\n🔗 관계 타입별 개수:")
-    rel_stats = db.execute_query("""
-        MATCH ()-[r]->()
-        RETURN type(r) as type, count(r) as count
-        ORDER BY count DESC
-    """)
-    
-    total_rels = 0
     if rel_stats:
         for record in rel_stats:
-            count = record['count']
-            total_rels += count
-            print(f"   - {record['type']}: {count:,}")
+            print(f"   - {record['type']}: {record['count']:,}")
     else:
         print("   (관계 없음)")
     
-    print(f"\n   🔗 총 관계 수: {total_rels:,}")
+    print(f"\n   🔗 총 관계 수: {overview['total_rels']:,}")
     
     # 소스 파일별 통계
     print(f"\n📄 소스 파일별 노드 개수:")
-    source_stats = db.execute_query("""
-        MATCH (n)
-        WHERE n.source_file IS NOT NULL
-        RETURN n.source_file as source, count(n) as count
-        ORDER BY count DESC
-    """)
-    
     if source_stats:
         for record in source_stats:
             print(f"   - {record['source']}: {record['count']:,} nodes")
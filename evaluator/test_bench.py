@@ -16,6 +16,7 @@ import os
 from typing import Dict, List, Any, Tuple
 from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 
 # Add src to path
@@ -377,6 +378,10 @@ class QualityEvaluator:
     def __init__(self, api_base_url: str = "http://localhost:8000"):
         self.api_base_url = api_base_url
         self.test_cases = self._load_test_cases()
+        
+        # Shared HTTP session (keep-alive across all test queries)
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
         self.results = []
         
         # Initialize testers
@@ -427,7 +432,7 @@ class QualityEvaluator:
         # 2. Query the system
         print("\n2️⃣ Querying system...")
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_base_url}/query",
                 json={
                     "question": test_case['query'],
@@ -525,29 +530,35 @@ class QualityEvaluator:
         """
         total_tests = len(self.results)
         
-        # Security stats
-        security_passed = sum(1 for r in self.results if r.get('security', {}).get('passed', False))
-        security_violations = sum(r.get('security', {}).get('scan_result', {}).get('violation_count', 0) for r in self.results)
-        
-        # Format stats
-        format_passed = sum(1 for r in self.results if r.get('format', {}).get('compliant', False))
-        avg_format_compliance = sum(r.get('format', {}).get('compliance_rate', 0) for r in self.results) / total_tests if total_tests > 0 else 0
-        
-        # Accuracy stats
-        accuracy_passed = sum(1 for r in self.results if r.get('accuracy', {}).get('passed', False))
-        avg_accuracy = sum(r.get('accuracy', {}).get('accuracy_score', 0) for r in self.results) / total_tests if total_tests > 0 else 0
-        
-        # Multi-hop stats
-        multihop_scores = [r.get('multihop', {}).get('score', 0) for r in self.results if 'multihop' in r]
+        # Aggregate all stats in a single pass over the results
+        security_passed = 0
+        security_violations = 0
+        format_passed = 0
+        format_compliance_total = 0
+        accuracy_passed = 0
+        accuracy_total = 0
+        multihop_scores = []
+        overall_passed = 0
+        
+        for r in self.results:
+            security = r.get('security', {})
+            format_result = r.get('format', {})
+            accuracy = r.get('accuracy', {})
+            
+            security_passed += bool(security.get('passed', False))
+            security_violations += security.get('scan_result', {}).get('violation_count', 0)
+            format_passed += bool(format_result.get('compliant', False))
+            format_compliance_total += format_result.get('compliance_rate', 0)
+            accuracy_passed += bool(accuracy.get('passed', False))
+            accuracy_total += accuracy.get('accuracy_score', 0)
+            if 'multihop' in r:
+                multihop_scores.append(r['multihop'].get('score', 0))
+            overall_passed += bool(security.get('passed', False) and accuracy.get('passed', False))
+        
+        avg_format_compliance = format_compliance_total / total_tests if total_tests > 0 else 0
+        avg_accuracy = accuracy_total / total_tests if total_tests > 0 else 0
         avg_multihop = sum(multihop_scores) / len(multihop_scores) if multihop_scores else 0
         
-        # Overall pass rate
-        overall_passed = sum(
-            1 for r in self.results 
-            if r.get('security', {}).get('passed', False) 
-            and r.get('accuracy', {}).get('passed', False)
-        )
-        
         report = {
             'summary': {
                 'total_tests': total_tests,
@@ -655,6 +666,10 @@ class QualityEvaluator:
         
         print("\n" + "="*70)
     
+    def close(self):
+        """Close the shared HTTP session"""
+        self.session.close()
+    
     def save_report(self, report: Dict[str, Any], filepath: str = "evaluation_report.json"):
         """Save report to JSON file"""
         with open(filepath, 'w') as f:
@@ -666,25 +681,29 @@ def main():
     """Main evaluation function"""
     print("\n🚀 Starting Quality Evaluation System")
     
-    # Check if backend is running
-    try:
-        response = requests.get("http://localhost:8000/health", timeout=3)
-        if response.status_code != 200:
-            print("❌ Backend not healthy")
-            return
-    except:
-        print("❌ Backend not running. Start with: ./start.sh")
-        return
-    
-    # Run evaluation
     evaluator = QualityEvaluator()
-    report = evaluator.run_full_evaluation()
-    
-    # Print report
-    evaluator.print_report(report)
     
-    # Save report
-    evaluator.save_report(report, "evaluator/evaluation_report.json")
+    try:
+        # Check if backend is running
+        try:
+            response = evaluator.session.get(f"{evaluator.api_base_url}/health", timeout=3)
+            if response.status_code != 200:
+                print("❌ Backend not healthy")
+                return
+        except:
+            print("❌ Backend not running. Start with: ./start.sh")
+            return
+        
+        # Run evaluation
+        report = evaluator.run_full_evaluation()
+        
+        # Print report
+        evaluator.print_report(report)
+        
+        # Save report
+        evaluator.save_report(report, "evaluator/evaluation_report.json")
+    finally:
+        evaluator.close()
     
     print("\n✅ Evaluation complete!")
 
@@ -5,6 +5,7 @@ Provides insights on supply chain risks, talent flow, and hidden relationships
 """
 
 import asyncio
+import functools
 from typing import Dict, List, Any, Optional
 import sys
 import os
@@ -50,6 +51,8 @@ class PrivacyAnalystAgent:
         """
         self.neo4j_db = neo4j_db
         self.neo4j_retriever = neo4j_retriever
+        # Per-instance cache so repeated lookups of the same term skip Neo4j
+        self._neo4j_search_cached = functools.lru_cache(maxsize=512)(self._neo4j_search_impl)
         self.ollama_client = AsyncClient(host=OLLAMA_BASE_URL) if OLLAMA_AVAILABLE else None
         self.llm_model = LOCAL_MODELS["llm"]
         
@@ -107,6 +110,14 @@ class PrivacyAnalystAgent:
         if not self.neo4j_db:
             return []
         
+        try:
+            return list(self._neo4j_search_cached(query) or [])
+        except Exception as e:
+            print(f"⚠️  Neo4j search error: {e}")
+            return []
+    
+    def _neo4j_search_impl(self, query: str) -> List[Dict[str, Any]]:
+        """Run the entity search query (wrapped by the per-instance cache)"""
         cypher = """
 MATCH (n)
 WHERE toLower(n.name) CONTAINS toLower($query)
@@ -114,12 +125,7 @@ RETURN n.name AS name, labels(n)[0] AS type, properties(n) AS properties
 LIMIT 20
 """
         
-        try:
-            results = self.neo4j_db.execute_query(cypher, {"query": query})
-            return results
-        except Exception as e:
-            print(f"⚠️  Neo4j search error: {e}")
-            return []
+        return self.neo4j_db.execute_query(cypher, {"query": query})
     
     def _neo4j_search_sync(self, query: str) -> str:
         """Synchronous wrapper for neo4j_search"""
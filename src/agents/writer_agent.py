@@ -260,7 +260,7 @@ JSON 형식으로 응답:
             
             for key in context.neo4j_keys:
                 # Neo4j에서 노드 조회
-                with self._neo4j_db.driver.session() as session:
+                with self._neo4j_db.driver.session(database=self._neo4j_db.database) as session:
                     result = session.run(
                         "MATCH (n {id: $key}) RETURN n",
                         key=key
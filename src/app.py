@@ -866,9 +866,7 @@ async def ingest_pdf(file: UploadFile = File(...)):
         try:
             import pymupdf
             doc = pymupdf.open(tmp_path)
-            text = ""
-            for page in doc:
-                text += page.get_text()
+            text = "".join(page.get_text() for page in doc)
             doc.close()
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"PDF text extraction failed: {str(e)}")
@@ -1007,9 +1005,7 @@ async def ingest_pdf_db(file: UploadFile = File(...)):
         try:
             import pymupdf
             doc = pymupdf.open(tmp_path)
-            text = ""
-            for page in doc:
-                text += page.get_text()
+            text = "".join(page.get_text() for page in doc)
             doc.close()
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"PDF text extraction failed: {str(e)}")
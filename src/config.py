@@ -4,7 +4,7 @@ Manages environment variables and model settings with strict typing
 """
 
 import os
-from typing import Literal, Dict, Any
+from typing import Literal, Dict, Any, Optional
 
 try:
     from dotenv import load_dotenv
@@ -18,6 +18,9 @@ RUN_MODE: Literal["API", "LOCAL"] = os.getenv("RUN_MODE", "API")  # type: ignore
 # OpenAI API Configuration
 OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
 OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+# Account rate limits used to throttle bulk extraction (defaults: gpt-4o-mini tier 1)
+OPENAI_RPM_LIMIT: int = int(os.getenv("OPENAI_RPM_LIMIT", "500"))
+OPENAI_TPM_LIMIT: int = int(os.getenv("OPENAI_TPM_LIMIT", "200000"))
 
 # Ollama Configuration (하이브리드 클라우드 지원)
 OLLAMA_BASE_URL: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
@@ -46,6 +49,10 @@ DEV_MODE_MAX_CHARS: int = int(os.getenv("DEV_MODE_MAX_CHARS", "5000"))
 NEO4J_URI: str = os.getenv("NEO4J_URI", "")
 NEO4J_USERNAME: str = os.getenv("NEO4J_USERNAME", "neo4j")
 NEO4J_PASSWORD: str = os.getenv("NEO4J_PASSWORD", "")
+# 비워두면 서버의 홈 DB 사용 (설정하면 모든 세션이 이 DB로 고정)
+NEO4J_DATABASE: Optional[str] = os.getenv("NEO4J_DATABASE") or None
+NEO4J_POOL_SIZE: int = int(os.getenv("NEO4J_POOL_SIZE", "50"))
+NEO4J_ACQUISITION_TIMEOUT: float = float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "30"))
 NEO4J_AUTO_EXPORT: bool = os.getenv("NEO4J_AUTO_EXPORT", "false").lower() in ("true", "1", "yes")
 
 # Financial entity types for prioritized extraction
@@ -5,7 +5,7 @@ GraphRAG 인덱싱 결과를 Neo4j에 저장하고, PDF 파싱 기능도 제공
 
 import os
 import sys
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 import networkx as nx
 
 # .env 파일 읽기
@@ -18,6 +18,7 @@ except ImportError:
 # neo4j 드라이버가 있는지 확인
 try:
     from neo4j import GraphDatabase
+    from neo4j.exceptions import ClientError
     NEO4J_AVAILABLE = True
 except ImportError:
     NEO4J_AVAILABLE = False
@@ -26,7 +27,10 @@ except ImportError:
 # src 디렉토리를 Python path에 추가
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD
+from config import (
+    NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD, NEO4J_DATABASE,
+    NEO4J_POOL_SIZE, NEO4J_ACQUISITION_TIMEOUT
+)
 from utils import extract_text_from_pdf
 from models.neo4j_models import GraphStats
 try:
@@ -51,7 +55,10 @@ class Neo4jDatabase:
         self,
         uri: Optional[str] = None,
         username: Optional[str] = None,
-        password: Optional[str] = None
+        password: Optional[str] = None,
+        database: Optional[str] = None,
+        max_connection_pool_size: Optional[int] = None,
+        connection_acquisition_timeout: Optional[float] = None
     ) -> None:
         """
         Neo4j 연결을 초기화하는 함수
@@ -60,6 +67,9 @@ class Neo4jDatabase:
             uri: Neo4j URI (예: neo4j+s://xxxxx.databases.neo4j.io)
             username: Neo4j 사용자 이름 (기본값: config에서 가져옴)
             password: Neo4j 비밀번호 (기본값: config에서 가져옴)
+            database: 대상 데이터베이스 이름 (기본값: config에서 가져옴)
+            max_connection_pool_size: 드라이버 커넥션 풀 크기 (기본값: NEO4J_POOL_SIZE)
+            connection_acquisition_timeout: 풀에서 커넥션을 기다리는 최대 초 (기본값: NEO4J_ACQUISITION_TIMEOUT)
         """
         if not NEO4J_AVAILABLE:
             raise ImportError("neo4j 패키지가 설치되지 않았어요! 'pip install neo4j'로 설치해주세요.")
@@ -68,6 +78,8 @@ class Neo4jDatabase:
         self.uri = uri or NEO4J_URI or os.getenv("NEO4J_URI", "")
         self.username = username or NEO4J_USERNAME or os.getenv("NEO4J_USERNAME", "neo4j")
         self.password = password or NEO4J_PASSWORD or os.getenv("NEO4J_PASSWORD", "")
+        # NEO4J_DATABASE가 설정되면 모든 세션을 그 DB로 고정 (None이면 서버의 홈 DB)
+        self.database = database or NEO4J_DATABASE
         
         # 연결 정보 검증
         if not self.uri:
@@ -85,7 +97,12 @@ class Neo4jDatabase:
             )
         
         # Neo4j 드라이버 생성
-        self.driver = GraphDatabase.driver(self.uri, auth=(self.username, self.password))
+        self.driver = GraphDatabase.driver(
+            self.uri,
+            auth=(self.username, self.password),
+            max_connection_pool_size=max_connection_pool_size or NEO4J_POOL_SIZE,
+            connection_acquisition_timeout=connection_acquisition_timeout or NEO4J_ACQUISITION_TIMEOUT
+        )
         
         print(f"✅ Neo4j 연결 성공! URI: {self.uri.split('@')[-1] if '@' in self.uri else self.uri}")
     
@@ -95,20 +112,21 @@ class Neo4jDatabase:
             self.driver.close()
             print("🔌 Neo4j 연결이 종료되었어요.")
 
-    def execute_query(self, query: str, params: Optional[Dict[str, str | int | float]] = None) -> None:
+    def execute_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Execute raw Cypher query
 
         Args:
             query: Cypher query string
             params: Optional parameters for the query
+
+        Returns:
+            Result records as a list of dicts
         """
         try:
-            with self.driver.session() as session:
-                if params:
-                    session.run(query, **params)
-                else:
-                    session.run(query)
+            with self.driver.session(database=self.database) as session:
+                result = session.run(query, parameters=params or {})
+                return [record.data() for record in result]
         except Exception as e:
             droneLogError("Neo4j query execution failed", e)
             raise
@@ -146,7 +164,7 @@ class Neo4jDatabase:
         }
         
         # 쿼리 실행
-        with self.driver.session() as session:
+        with self.driver.session(database=self.database) as session:
             session.run(query, **params)
     
     def create_relationship(
@@ -200,7 +218,7 @@ class Neo4jDatabase:
         }
         
         # 쿼리 실행
-        with self.driver.session() as session:
+        with self.driver.session(database=self.database) as session:
             session.run(query, **params)
     
     def upload_graphml(
@@ -279,11 +297,112 @@ class Neo4jDatabase:
         """Neo4j의 모든 데이터를 삭제하는 함수예요! (주의: 위험한 작업)"""
         query = "MATCH (n) DETACH DELETE n"
         
-        with self.driver.session() as session:
+        with self.driver.session(database=self.database) as session:
             session.run(query)
         
         print("🗑️ Neo4j의 모든 데이터가 삭제되었어요!")
     
+    def get_breakdown_stats(self, source_limit: Optional[int] = 10) -> Dict[str, Any]:
+        """
+        노드 라벨별 / 관계 타입별 / 소스 파일별 개수를 한 번의 round-trip으로 가져오는 함수예요!
+        APOC이 있으면 라벨/관계 개수는 count store(apoc.meta.stats)에서 읽어서 전체 스캔을 피해요
+        
+        라벨별 개수는 노드가 가진 모든 라벨을 각각 세요 (APOC과 같은 기준).
+        라벨이 여러 개인 노드는 여러 번 세어지므로 node_stats의 합은 총 노드 수와 다를 수 있어요
+        → 총 개수는 total_nodes / total_rels를 사용하세요
+        
+        Args:
+            source_limit: 소스 파일 통계 최대 개수 (None이면 전체, 0이면 생략)
+        
+        Returns:
+            {'node_stats': [{type, count}], 'rel_stats': [{type, count}], 'source_stats': [{source, count}],
+             'total_nodes': int, 'total_rels': int}
+            (목록은 개수 내림차순)
+        """
+        if source_limit == 0:
+            # 소스 통계가 필요 없으면 노드 스캔 자체를 생략
+            source_subquery = "WITH *, [] as source_stats"
+        else:
+            limit_clause = f"LIMIT {int(source_limit)}" if source_limit is not None else ""
+            source_subquery = f"""
+            CALL {{
+                MATCH (n)
+                WHERE n.source_file IS NOT NULL
+                WITH n.source_file as source, count(n) as count
+                ORDER BY count DESC
+                {limit_clause}
+                RETURN collect({{source: source, count: count}}) as source_stats
+            }}
+            """
+        
+        try:
+            # execute_query를 거치지 않고 직접 실행: APOC이 없는 건 예상된 상황이라 에러 로그를 남기지 않아요
+            with self.driver.session(database=self.database) as session:
+                records = session.run(f"""
+                    CALL apoc.meta.stats() YIELD labels, relTypesCount, nodeCount, relCount
+                    {source_subquery}
+                    RETURN labels, relTypesCount, nodeCount, relCount, source_stats
+                """).data()
+            row = records[0] if records else {}
+            
+            def by_count(counts: Dict[str, int]) -> List[Dict[str, Any]]:
+                return [
+                    {'type': name, 'count': count}
+                    for name, count in sorted(counts.items(), key=lambda item: item[1], reverse=True)
+                    if count
+                ]
+            
+            return {
+                'node_stats': by_count(row.get('labels') or {}),
+                'rel_stats': by_count(row.get('relTypesCount') or {}),
+                'source_stats': row.get('source_stats', []),
+                'total_nodes': row.get('nodeCount', 0),
+                'total_rels': row.get('relCount', 0)
+            }
+        except ClientError as e:
+            # APOC이 없을 때만 순수 Cypher CALL 서브쿼리로 (여전히 한 번의 round-trip)
+            # 그 외 오류(연결, 권한, 문법 등)는 그대로 올려요
+            if e.code != "Neo.ClientError.Procedure.ProcedureNotFound":
+                droneLogError("Neo4j query execution failed", e)
+                raise
+        except Exception as e:
+            droneLogError("Neo4j query execution failed", e)
+            raise
+        
+        records = self.execute_query(f"""
+            CALL {{
+                MATCH (n)
+                UNWIND labels(n) as type
+                WITH type, count(*) as count
+                ORDER BY count DESC
+                RETURN collect({{type: type, count: count}}) as node_stats
+            }}
+            CALL {{
+                MATCH ()-[r]->()
+                WITH type(r) as type, count(r) as count
+                ORDER BY count DESC
+                RETURN collect({{type: type, count: count}}) as rel_stats
+            }}
+            CALL {{
+                MATCH (n)
+                RETURN count(n) as total_nodes
+            }}
+            CALL {{
+                MATCH ()-[r]->()
+                RETURN count(r) as total_rels
+            }}
+            {source_subquery}
+            RETURN node_stats, rel_stats, total_nodes, total_rels, source_stats
+        """)
+        row = records[0] if records else {}
+        return {
+            'node_stats': row.get('node_stats', []),
+            'rel_stats': row.get('rel_stats', []),
+            'source_stats': row.get('source_stats', []),
+            'total_nodes': row.get('total_nodes', 0),
+            'total_rels': row.get('total_rels', 0)
+        }
+    
     def get_stats(self) -> GraphStats:
         """
         Neo4j의 통계를 가져오는 함수예요!
@@ -305,7 +424,7 @@ class Neo4jDatabase:
             생성 결과 딕셔너리
         """
         try:
-            with self.driver.session() as session:
+            with self.driver.session(database=self.database) as session:
                 # Constraints (노드 고유성)
                 constraints = [
                     "CREATE CONSTRAINT event_id IF NOT EXISTS FOR (e:Event) REQUIRE e.id IS UNIQUE",
@@ -423,7 +542,7 @@ class Neo4jDatabase:
             })
         
         # 쿼리 실행
-        with self.driver.session() as session:
+        with self.driver.session(database=self.database) as session:
             session.run(query, node_id=str(node_id), properties=properties)
     
     def create_domain_relationship(
@@ -482,7 +601,7 @@ class Neo4jDatabase:
             properties["impact_scope"] = str(rel_data.get("impact_scope", ""))
         
         # 쿼리 실행
-        with self.driver.session() as session:
+        with self.driver.session(database=self.database) as session:
             session.run(
                 query,
                 source_id=str(source_id),
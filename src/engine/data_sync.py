@@ -14,7 +14,7 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD
+from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD, NEO4J_DATABASE
 
 
 class RealTimeDataSync:
@@ -109,7 +109,7 @@ class RealTimeDataSync:
         RETURN c.name as name, c.stock_price as price
         """
         
-        with self.driver.session() as session:
+        with self.driver.session(database=NEO4J_DATABASE) as session:
             result = session.run(query)
             record = result.single()
             if record:
@@ -129,7 +129,7 @@ class RealTimeDataSync:
         RETURN m.name as name, m.value as value, m.change_percent as change_pct
         """
         
-        with self.driver.session() as session:
+        with self.driver.session(database=NEO4J_DATABASE) as session:
             result = session.run(query)
             record = result.single()
             if record:
@@ -189,7 +189,7 @@ class RealTimeDataSync:
                collect({name: c.name, change: c.price_change_pct}) as stocks
         """
         
-        with self.driver.session() as session:
+        with self.driver.session(database=NEO4J_DATABASE) as session:
             result = session.run(query)
             record = result.single()
             
@@ -242,7 +242,7 @@ class RealTimeDataSync:
                c.last_sync as timestamp
         """
         
-        with self.driver.session() as session:
+        with self.driver.session(database=NEO4J_DATABASE) as session:
             result = session.run(query)
             alerts = []
             
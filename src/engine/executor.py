@@ -13,7 +13,7 @@ from neo4j import GraphDatabase
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models.neo4j_models import Neo4jQueryResult, GraphStats
-from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD
+from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD, NEO4J_DATABASE
 
 logger = logging.getLogger(__name__)
 
@@ -70,7 +70,7 @@ class QueryExecutor:
         params = parameters or {}
         
         try:
-            with self.driver.session() as session:
+            with self.driver.session(database=NEO4J_DATABASE) as session:
                 result = session.run(query, **params)
                 rows = [dict(row) for row in result]
                 
@@ -99,7 +99,7 @@ class QueryExecutor:
         
         if result.nodes:
             # 첫 번째 행에서 통계 추출 (실제로는 쿼리 결과에서)
-            with self.driver.session() as session:
+            with self.driver.session(database=NEO4J_DATABASE) as session:
                 stats_result = session.run(query)
                 row = stats_result.single()
                 if row:
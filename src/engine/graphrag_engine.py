@@ -581,7 +581,8 @@ Streamlit UI에서 "Privacy Mode" 체크박스를 활성화했는지 확인하
                 content = str(report_data)
             
             # 커뮤니티 제목 추출 (첫 번째 줄의 # 제거)
-            lines = content.split('\n')
+            # 앞의 3줄만 쓰므로 maxsplit으로 나머지는 나누지 않음
+            lines = content.split('\n', 3)
             title = lines[0].replace('#', '').strip() if lines else "Community Summary"
             
             # 내용 요약 (첫 3줄 정도)
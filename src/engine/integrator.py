@@ -17,10 +17,16 @@ from neo4j import GraphDatabase
 from datetime import datetime
 
 try:
-    from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD
+    from config import (
+        NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD, NEO4J_DATABASE,
+        NEO4J_POOL_SIZE, NEO4J_ACQUISITION_TIMEOUT
+    )
     from engine.connection_check import check_local_model_before_processing
 except ImportError:
-    from ..config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD
+    from ..config import (
+        NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD, NEO4J_DATABASE,
+        NEO4J_POOL_SIZE, NEO4J_ACQUISITION_TIMEOUT
+    )
     from .connection_check import check_local_model_before_processing
 
 try:
@@ -78,7 +84,8 @@ class EntityResolver:
         entity_lower = entity_clean.lower()
         for canonical, aliases in cls.ALIASES.items():
             for alias in aliases:
-                if alias.lower() in entity_lower or entity_lower in alias.lower():
+                alias_lower = alias.lower()
+                if alias_lower in entity_lower or entity_lower in alias_lower:
                     return canonical
         
         # Return as-is if no match
@@ -135,15 +142,45 @@ class DataIntegrator:
     - JSON indicator data
     """
     
-    def __init__(self):
-        try:
-            self.driver = GraphDatabase.driver(
-                NEO4J_URI,
-                auth=(NEO4J_USERNAME, NEO4J_PASSWORD)
-            )
-        except Exception as e:
-            droneLogError("Neo4j driver initialization failed", e)
-            raise
+    # Extracted entity type → Neo4j label (anything else becomes Entity)
+    ENTITY_TYPE_LABELS = {
+        "COMPANY": "Company",
+        "PERSON": "Person",
+        "PRODUCT": "Product",
+        "LOCATION": "Location",
+        "FINANCIAL_METRIC": "FinancialMetric",
+        "REGULATION": "Regulation",
+        "CATALYST": "Catalyst",
+        "RISK": "Risk",
+        "TECH": "Technology"
+    }
+    
+    # Rows per UNWIND write transaction in ingestPdfGraph
+    INGEST_BATCH_SIZE = 1000
+    
+    def __init__(self, driver=None, database: Optional[str] = None):
+        """
+        Args:
+            driver: Existing neo4j Driver to share (e.g. Neo4jDatabase.driver);
+                close() leaves a shared driver open for its owner
+            database: Target database for every session (default: NEO4J_DATABASE, None = home DB)
+        """
+        # None = server home DB; when NEO4J_DATABASE is set every session is pinned to it
+        self.database = database or NEO4J_DATABASE
+        self._owns_driver = driver is None
+        if driver is not None:
+            self.driver = driver
+        else:
+            try:
+                self.driver = GraphDatabase.driver(
+                    NEO4J_URI,
+                    auth=(NEO4J_USERNAME, NEO4J_PASSWORD),
+                    max_connection_pool_size=NEO4J_POOL_SIZE,
+                    connection_acquisition_timeout=NEO4J_ACQUISITION_TIMEOUT
+                )
+            except Exception as e:
+                droneLogError("Neo4j driver initialization failed", e)
+                raise
         self.resolver = EntityResolver()
         self.stats = {
             'entities_merged': 0,
@@ -171,18 +208,7 @@ class DataIntegrator:
         """
         Normalize entity type to Neo4j label
         """
-        typeMap = {
-            "COMPANY": "Company",
-            "PERSON": "Person",
-            "PRODUCT": "Product",
-            "LOCATION": "Location",
-            "FINANCIAL_METRIC": "FinancialMetric",
-            "REGULATION": "Regulation",
-            "CATALYST": "Catalyst",
-            "RISK": "Risk",
-            "TECH": "Technology"
-        }
-        return typeMap.get(str(entityType).upper(), "Entity")
+        return self.ENTITY_TYPE_LABELS.get(str(entityType).upper(), "Entity")
 
     def filterProperties(self, properties: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -197,8 +223,9 @@ class DataIntegrator:
         return safeProps
     
     def close(self):
-        """Close Neo4j connection"""
-        self.driver.close()
+        """Close Neo4j connection (only if this integrator created the driver)"""
+        if self._owns_driver:
+            self.driver.close()
     
     def merge_entity(
         self,
@@ -237,7 +264,7 @@ class DataIntegrator:
         RETURN e.name as name
         """
         
-        with self.driver.session() as session:
+        with self.driver.session(database=self.database) as session:
             result = session.run(query)
             self.stats['entities_merged'] += 1
             return canonical_name
@@ -265,10 +292,79 @@ class DataIntegrator:
         RETURN type(r) as rel_type
         """
         
-        with self.driver.session() as session:
+        with self.driver.session(database=self.database) as session:
             session.run(query)
             self.stats['relationships_created'] += 1
     
+    def merge_entities_bulk(
+        self,
+        entity_type: str,
+        entities: List[Dict[str, Any]]
+    ) -> List[str]:
+        """
+        Merge many entities of one label in a single UNWIND query
+        
+        Args:
+            entity_type: Node label shared by all rows (Company, Country, etc.)
+            entities: Rows of {'name': ..., 'props': {...}}
+        
+        Returns:
+            Canonical entity names
+        """
+        label = self.sanitizeLabel(entity_type)
+        rows = [
+            {
+                'name': self.resolver.resolve(entity['name']),
+                'props': self.filterProperties(entity.get('props') or {})
+            }
+            for entity in entities
+            if entity.get('name')
+        ]
+        if not rows:
+            return []
+        
+        query = f"""
+        UNWIND $rows AS r
+        MERGE (e:{label} {{name: r.name}})
+        SET e += r.props,
+            e.updated_at = datetime()
+        """
+        
+        with self.driver.session(database=self.database) as session:
+            session.run(query, rows=rows)
+        self.stats['entities_merged'] += len(rows)
+        return [row['name'] for row in rows]
+    
+    def create_relationships_bulk(self, relationships: List[Dict[str, Any]]):
+        """
+        Create many relationships with one UNWIND query per relationship type
+        
+        Args:
+            relationships: Rows of {'a': from, 'b': to, 'type': REL_TYPE, 'props': {...}}
+        """
+        rows_by_type: Dict[str, List[Dict[str, Any]]] = {}
+        for rel in relationships:
+            if not rel.get('a') or not rel.get('b'):
+                continue
+            rel_type = self.sanitizeRelType(rel.get('type', 'RELATED'))
+            rows_by_type.setdefault(rel_type, []).append({
+                'a': self.resolver.resolve(rel['a']),
+                'b': self.resolver.resolve(rel['b']),
+                'props': self.filterProperties(rel.get('props') or {})
+            })
+        
+        with self.driver.session(database=self.database) as session:
+            for rel_type, rows in rows_by_type.items():
+                query = f"""
+                UNWIND $rows AS r
+                MATCH (a {{name: r.a}})
+                MATCH (b {{name: r.b}})
+                MERGE (a)-[rel:{rel_type}]->(b)
+                SET rel += r.props
+                """
+                session.run(query, rows=rows)
+                self.stats['relationships_created'] += len(rows)
+    
     def ingest_csv(self, csv_path: str, mapping: Dict[str, str]):
         """
         Ingest CSV file with column mapping
@@ -438,6 +534,11 @@ class DataIntegrator:
         
         print(f"✅ Merged {self.stats['pdf_chunks']} PDF entities")
 
+    @staticmethod
+    def _runUnwindBatch(tx, query: str, rows: List[Dict[str, Any]], params: Dict[str, Any]) -> None:
+        """Run one UNWIND batch inside a managed write transaction"""
+        tx.run(query, rows=rows, **params).consume()
+
     def ingestPdfGraph(
         self,
         graphData: Dict[str, Any],
@@ -447,6 +548,9 @@ class DataIntegrator:
         """
         Ingest PDF graph data (entities + relationships) into Neo4j
 
+        Rows are grouped by label / relationship type and written with UNWIND,
+        INGEST_BATCH_SIZE rows per write transaction.
+
         Args:
             graphData: Dict with 'entities' and 'relationships'
             sourceFile: Original PDF filename
@@ -460,70 +564,194 @@ class DataIntegrator:
                 "relationshipsCreated": 0
             }
 
-            with self.driver.session() as session:
-                for entity in entities:
-                    name = entity.get("name")
-                    if not name:
-                        continue
+            entityRows: Dict[str, List[Dict[str, Any]]] = {}
+            for entity in entities:
+                name = entity.get("name")
+                if not name:
+                    continue
 
-                    entityType = self.normalizeEntityType(entity.get("type", "Entity"))
-                    label = self.sanitizeLabel(entityType)
-                    rawProps = entity.get("properties", {}) if isinstance(entity.get("properties"), dict) else {}
-                    properties = self.filterProperties(rawProps)
-                    canonicalName = self.resolver.resolve(name)
+                entityType = self.normalizeEntityType(entity.get("type", "Entity"))
+                label = self.sanitizeLabel(entityType)
+                rawProps = entity.get("properties", {}) if isinstance(entity.get("properties"), dict) else {}
+                entityRows.setdefault(label, []).append({
+                    "name": self.resolver.resolve(name),
+                    "props": self.filterProperties(rawProps)
+                })
+
+            relRows: Dict[str, List[Dict[str, Any]]] = {}
+            for rel in relationships:
+                source = rel.get("source")
+                target = rel.get("target")
+                if not source or not target:
+                    continue
 
+                relType = self.sanitizeRelType(rel.get("type", "RELATED"))
+                rawRelProps = rel.get("properties", {}) if isinstance(rel.get("properties"), dict) else {}
+                relRows.setdefault(relType, []).append({
+                    "source": self.resolver.resolve(source),
+                    "target": self.resolver.resolve(target),
+                    "props": self.filterProperties(rawRelProps)
+                })
+
+            batchSize = self.INGEST_BATCH_SIZE
+            with self.driver.session(database=self.database) as session:
+                for label, rows in entityRows.items():
                     query = f"""
-                    MERGE (e:{label} {{name: $name}})
-                    SET e += $props,
+                    UNWIND $rows AS r
+                    MERGE (e:{label} {{name: r.name}})
+                    SET e += r.props,
                         e.source = $source,
                         e.source_label = $sourceLabel,
                         e.source_file = $sourceFile,
                         e.updated_at = datetime()
                     """
-                    session.run(
-                        query,
+                    params = {"source": "pdf", "sourceLabel": sourceLabel, "sourceFile": sourceFile}
+                    for i in range(0, len(rows), batchSize):
+                        session.execute_write(self._runUnwindBatch, query, rows[i:i + batchSize], params)
+                    localStats["entitiesMerged"] += len(rows)
+
+                for relType, rows in relRows.items():
+                    query = f"""
+                    UNWIND $rows AS r
+                    MERGE (a {{name: r.source}})
+                    MERGE (b {{name: r.target}})
+                    MERGE (a)-[rel:{relType}]->(b)
+                    SET rel += r.props,
+                        rel.source = $sourceLabel,
+                        rel.source_file = $sourceFile,
+                        rel.updated_at = datetime()
+                    """
+                    params = {"sourceLabel": sourceLabel, "sourceFile": sourceFile}
+                    for i in range(0, len(rows), batchSize):
+                        session.execute_write(self._runUnwindBatch, query, rows[i:i + batchSize], params)
+                    localStats["relationshipsCreated"] += len(rows)
+
+            self.stats["entities_merged"] += localStats["entitiesMerged"]
+            self.stats["relationships_created"] += localStats["relationshipsCreated"]
+            return localStats
+        except Exception as e:
+            droneLogError("PDF graph ingestion failed", e)
+            raise
+    
+    def bulkIngestPdfGraphs(
+        self,
+        graphs: List[Tuple[Dict[str, Any], str, str]],
+        importDir: str,
+        rowsPerTransaction: int = 10000
+    ) -> Dict[str, int]:
+        """
+        Cold-start bulk load of many PDF graphs via CSV + LOAD CSV
+
+        Entities and relationships from all PDFs are deduplicated in memory,
+        written to one CSV per label (and per relationship type/endpoint labels)
+        in importDir, then loaded with LOAD CSV ... CALL {} IN TRANSACTIONS.
+        importDir must be the directory the Neo4j server resolves file:/// URLs
+        against. CSV values load as strings and empty cells clear properties,
+        so this is meant for an empty or freshly created database.
+
+        Args:
+            graphs: (graphData, sourceFile, sourceLabel) per PDF
+            importDir: Neo4j import directory
+            rowsPerTransaction: Rows committed per inner transaction
+        """
+        try:
+            nodeRows: Dict[str, Dict[str, Dict[str, Any]]] = {}
+            nameLabels: Dict[str, str] = {}
+            for graphData, sourceFile, sourceLabel in graphs:
+                for entity in graphData.get("entities", []):
+                    name = entity.get("name")
+                    if not name:
+                        continue
+
+                    label = self.sanitizeLabel(self.normalizeEntityType(entity.get("type", "Entity")))
+                    canonicalName = self.resolver.resolve(name)
+                    rawProps = entity.get("properties", {}) if isinstance(entity.get("properties"), dict) else {}
+                    row = nodeRows.setdefault(label, {}).setdefault(canonicalName, {})
+                    row.update(self.filterProperties(rawProps))
+                    row.update(
                         name=canonicalName,
-                        props=properties,
                         source="pdf",
-                        sourceLabel=sourceLabel,
-                        sourceFile=sourceFile
+                        source_label=sourceLabel,
+                        source_file=sourceFile
                     )
-                    localStats["entitiesMerged"] += 1
+                    nameLabels[canonicalName] = label
 
-                for rel in relationships:
+            relRows: Dict[Tuple[str, str, str], Dict[Tuple[str, str], Dict[str, Any]]] = {}
+            for graphData, sourceFile, sourceLabel in graphs:
+                for rel in graphData.get("relationships", []):
                     source = rel.get("source")
                     target = rel.get("target")
                     if not source or not target:
                         continue
 
+                    source = self.resolver.resolve(source)
+                    target = self.resolver.resolve(target)
                     relType = self.sanitizeRelType(rel.get("type", "RELATED"))
+                    key = (relType, nameLabels.get(source, "Entity"), nameLabels.get(target, "Entity"))
                     rawRelProps = rel.get("properties", {}) if isinstance(rel.get("properties"), dict) else {}
-                    relProps = self.filterProperties(rawRelProps)
-
-                    query = f"""
-                    MERGE (a {{name: $source}})
-                    MERGE (b {{name: $target}})
-                    MERGE (a)-[r:{relType}]->(b)
-                    SET r += $props,
-                        r.source = $sourceLabel,
-                        r.source_file = $sourceFile,
-                        r.updated_at = datetime()
-                    """
-                    session.run(
-                        query,
-                        source=self.resolver.resolve(source),
-                        target=self.resolver.resolve(target),
-                        props=relProps,
-                        sourceLabel=sourceLabel,
-                        sourceFile=sourceFile
+                    row = relRows.setdefault(key, {}).setdefault((source, target), {})
+                    row.update(self.filterProperties(rawRelProps))
+                    row.update(
+                        start_name=source,
+                        end_name=target,
+                        source=sourceLabel,
+                        source_file=sourceFile
                     )
-                    localStats["relationshipsCreated"] += 1
+
+            importPath = Path(importDir)
+            importPath.mkdir(parents=True, exist_ok=True)
+
+            def writeCsv(fileName: str, rows: List[Dict[str, Any]]) -> None:
+                fieldNames: Dict[str, None] = {}
+                for row in rows:
+                    fieldNames.update(dict.fromkeys(row))
+                with open(importPath / fileName, "w", encoding="utf-8", newline="") as f:
+                    writer = csv.DictWriter(f, fieldnames=list(fieldNames))
+                    writer.writeheader()
+                    writer.writerows(rows)
+
+            localStats = {
+                "entitiesMerged": 0,
+                "relationshipsCreated": 0
+            }
+            batchRows = int(rowsPerTransaction)
+            with self.driver.session(database=self.database) as session:
+                for label, rowsByName in nodeRows.items():
+                    fileName = f"pdf_nodes_{label}.csv"
+                    writeCsv(fileName, list(rowsByName.values()))
+                    session.run(f"""
+                    LOAD CSV WITH HEADERS FROM 'file:///{fileName}' AS r
+                    CALL {{
+                        WITH r
+                        MERGE (e:{label} {{name: r.name}})
+                        SET e += r,
+                            e.updated_at = datetime()
+                    }} IN TRANSACTIONS OF {batchRows} ROWS
+                    """).consume()
+                    localStats["entitiesMerged"] += len(rowsByName)
+
+                for (relType, startLabel, endLabel), rowsByPair in relRows.items():
+                    fileName = f"pdf_rels_{relType}_{startLabel}_{endLabel}.csv"
+                    writeCsv(fileName, list(rowsByPair.values()))
+                    session.run(f"""
+                    LOAD CSV WITH HEADERS FROM 'file:///{fileName}' AS r
+                    CALL {{
+                        WITH r
+                        MERGE (a:{startLabel} {{name: r.start_name}})
+                        MERGE (b:{endLabel} {{name: r.end_name}})
+                        MERGE (a)-[rel:{relType}]->(b)
+                        SET rel += r,
+                            rel.updated_at = datetime()
+                        REMOVE rel.start_name, rel.end_name
+                    }} IN TRANSACTIONS OF {batchRows} ROWS
+                    """).consume()
+                    localStats["relationshipsCreated"] += len(rowsByPair)
 
             self.stats["entities_merged"] += localStats["entitiesMerged"]
             self.stats["relationships_created"] += localStats["relationshipsCreated"]
             return localStats
         except Exception as e:
-            droneLogError("PDF graph ingestion failed", e)
+            droneLogError("Bulk PDF graph ingestion failed", e)
             raise
     
     def link_metrics_to_entities(
@@ -569,7 +797,7 @@ class DataIntegrator:
             MERGE (c)-[r:HAS_METRIC]->(m)
             """
             
-            with self.driver.session() as session:
+            with self.driver.session(database=self.database) as session:
                 session.run(query)
                 self.stats['relationships_created'] += 1
         
@@ -609,7 +837,7 @@ class DataIntegrator:
             'properties_updated': 0
         }
         
-        with self.driver.session() as session:
+        with self.driver.session(database=self.database) as session:
             for entity in user_entities:
                 entity_name = entity.get('name', '')
                 entity_type = entity.get('type', 'Entity')
@@ -764,12 +992,7 @@ class DataIntegrator:
             raise ImportError("PyMuPDF required: pip install pymupdf")
         
         doc = fitz.open(pdf_path)
-        full_text = ""
-        
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            full_text += page.get_text()
-        
+        full_text = "".join(page.get_text() for page in doc)
         doc.close()
         
         # Process in chunks
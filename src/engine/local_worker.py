@@ -90,11 +90,7 @@ class LocalWorker:
             import pymupdf  # PyMuPDF
             
             doc = pymupdf.open(pdf_path)
-            text = ""
-            
-            for page in doc:
-                text += page.get_text()
-            
+            text = "".join(page.get_text() for page in doc)
             doc.close()
             return text
             
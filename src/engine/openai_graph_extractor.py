@@ -0,0 +1,510 @@
+"""
+OpenAI Graph Extractor
+Concurrent entity/relationship extraction from PDF text chunks with GPT-4o-mini
+Shared by the baseline upload scripts (upload_all_data.py, upload_baseline_pdfs.py)
+"""
+
+import asyncio
+import bisect
+import functools
+import hashlib
+import json
+import random
+import re
+import shelve
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from openai import AsyncOpenAI, APIConnectionError, APITimeoutError, RateLimitError
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+
+DEFAULT_MAX_CONCURRENCY = 20
+DEFAULT_CHUNKS_PER_REQUEST = 4
+MAX_TOKENS_PER_CHUNK = 2000
+MAX_RETRY_ATTEMPTS = 5
+# Completion time grows with the number of packed sections, so the timeout does too
+TIMEOUT_PER_CHUNK = 30
+
+# make_chunk_ranges sizes in tokens (~3000 characters per chunk)
+DEFAULT_CHUNK_TOKENS = 750
+DEFAULT_CHUNK_OVERLAP_TOKENS = 40
+DEFAULT_CHUNK_BOUNDARY_TOKENS = 200
+CHARS_PER_TOKEN = 4
+
+NON_SPACE_PATTERN = re.compile(r"\S")
+
+SYSTEM_MESSAGE = (
+    "You are a financial document analyzer. Extract structured entities and relationships "
+    "from every numbered section. Respond with valid JSON only: "
+    '{"results": [{"id": 0, "entities": [...], "relationships": [...]}, ...]} '
+    "with one result per section, keyed by its section id."
+)
+
+
+# Static part of the user prompt; only {sections} is filled per request
+PROMPT_TEMPLATE = """Extract business entities and relationships from each section of this semiconductor/financial text.
+Return ONLY valid JSON format, with one result per section:
+
+{{
+  "results": [
+    {{
+      "id": 0,
+      "entities": [
+        {{"name": "EntityName", "type": "COMPANY|PERSON|PRODUCT|TECHNOLOGY|FINANCIAL_METRIC|LOCATION|REGULATION|RISK", "properties": {{"key": "value"}}}}
+      ],
+      "relationships": [
+        {{"source": "EntityA", "target": "EntityB", "type": "RELATIONSHIP_TYPE", "properties": {{"key": "value"}}}}
+      ]
+    }}
+  ]
+}}
+
+Entity types: COMPANY, PERSON, PRODUCT, TECHNOLOGY, FINANCIAL_METRIC, LOCATION, REGULATION, RISK, MARKET, SUPPLY_CHAIN
+Relationship types: SUPPLIES, PURCHASES, COMPETES_WITH, HAS_CEO, EMPLOYS, LOCATED_IN, PRODUCES, IMPACTS, DEPENDS_ON, REGULATES
+
+{sections}
+
+JSON output:"""
+
+# Part of every ChunkCache key: editing either prompt invalidates cached results
+PROMPT_VERSION = hashlib.blake2b(
+    (SYSTEM_MESSAGE + "\0" + PROMPT_TEMPLATE).encode("utf-8"), digest_size=8
+).hexdigest()
+
+
+def build_extraction_prompt(batch: List[str]) -> str:
+    """Build the user prompt for a batch of chunks, one numbered section per chunk"""
+    sections = "\n\n".join(f"Section {i}:\n{chunk}" for i, chunk in enumerate(batch))
+    return PROMPT_TEMPLATE.format(sections=sections)
+
+
+def loads_json(data: Union[str, bytes]) -> Any:
+    """Parse JSON with orjson when installed, stdlib json otherwise"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the tiktoken encoding once; None if tiktoken is unavailable"""
+    try:
+        import tiktoken
+        return tiktoken.encoding_for_model("gpt-4o-mini")
+    except Exception:
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate prompt tokens (tiktoken if installed, else ~4 chars per token)"""
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // CHARS_PER_TOKEN + 1
+    return len(encoding.encode(text))
+
+
+def make_chunk_ranges(
+    text: str,
+    max_tokens: int = DEFAULT_CHUNK_TOKENS,
+    overlap_tokens: int = DEFAULT_CHUNK_OVERLAP_TOKENS,
+    boundary_tokens: int = DEFAULT_CHUNK_BOUNDARY_TOKENS
+) -> List[Tuple[int, int]]:
+    """
+    Split text into overlapping (start, end) character ranges that end on
+    paragraph breaks where possible
+
+    Windows are measured in tiktoken tokens when tiktoken is installed, otherwise
+    in characters (CHARS_PER_TOKEN per token). Each window is cut at the last
+    blank line within boundary_tokens of its end. Only offsets are returned, so
+    chunk strings are sliced from text when they are actually sent.
+
+    Args:
+        text: Full document text
+        max_tokens: Window size
+        overlap_tokens: Overlap between consecutive windows
+        boundary_tokens: How far back from the window end to look for a paragraph break
+
+    Returns:
+        Character ranges in document order
+    """
+    encoding = _get_encoding()
+    if encoding is None:
+        # 1 unit = 1 character
+        token_starts = None
+        total = len(text)
+        max_tokens *= CHARS_PER_TOKEN
+        overlap_tokens *= CHARS_PER_TOKEN
+        boundary_tokens *= CHARS_PER_TOKEN
+    else:
+        _, token_starts = encoding.decode_with_offsets(encoding.encode(text))
+        total = len(token_starts)
+
+    def char_at(unit: int) -> int:
+        if unit >= total:
+            return len(text)
+        return unit if token_starts is None else token_starts[unit]
+
+    def unit_at(char: int) -> int:
+        return char if token_starts is None else bisect.bisect_left(token_starts, char)
+
+    ranges: List[Tuple[int, int]] = []
+    start = 0
+    while start < total:
+        end = min(start + max_tokens, total)
+        char_start, char_end = char_at(start), char_at(end)
+        if end < total:
+            cut = text.rfind("\n\n", char_at(max(start, end - boundary_tokens)), char_end)
+            if cut > char_start:
+                char_end = cut
+                end = max(unit_at(cut), start + 1)
+        if NON_SPACE_PATTERN.search(text, char_start, char_end):
+            ranges.append((char_start, char_end))
+        if end >= total:
+            break
+        start = max(end - overlap_tokens, start + 1)
+    return ranges
+
+
+class RateLimiter:
+    """
+    Token-bucket throttle for OpenAI requests-per-minute and tokens-per-minute
+    Both buckets refill continuously; acquire() waits until a request fits
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.available_request_capacity = float(requests_per_minute)
+        self.available_token_capacity = float(tokens_per_minute)
+        self._last_update = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_update
+        self._last_update = now
+        self.available_request_capacity = min(
+            self.requests_per_minute,
+            self.available_request_capacity + self.requests_per_minute * elapsed / 60
+        )
+        self.available_token_capacity = min(
+            self.tokens_per_minute,
+            self.available_token_capacity + self.tokens_per_minute * elapsed / 60
+        )
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Wait until one request and the given token budget are available
+
+        Args:
+            tokens: Estimated tokens for the request (prompt + max completion)
+        """
+        tokens = min(tokens, self.tokens_per_minute)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.available_request_capacity >= 1 and self.available_token_capacity >= tokens:
+                    self.available_request_capacity -= 1
+                    self.available_token_capacity -= tokens
+                    return
+                request_wait = (1 - self.available_request_capacity) * 60 / self.requests_per_minute
+                token_wait = (tokens - self.available_token_capacity) * 60 / self.tokens_per_minute
+                await asyncio.sleep(max(request_wait, token_wait, 0.01))
+
+
+async def _create_with_backoff(
+    client: AsyncOpenAI,
+    rate_limiter: Optional[RateLimiter] = None,
+    estimated_tokens: int = 0,
+    **kwargs: Any
+):
+    """
+    chat.completions.create with random exponential backoff on rate limits/timeouts
+
+    This is the only retry layer: create the client with max_retries=0 so the
+    SDK's own retries don't multiply the attempts and the backoff time.
+    Every attempt (retries included) re-sends the full prompt, so each one
+    goes through the rate limiter with estimated_tokens.
+    """
+    for attempt in range(1, MAX_RETRY_ATTEMPTS + 1):
+        if rate_limiter:
+            await rate_limiter.acquire(estimated_tokens)
+        try:
+            return await client.chat.completions.create(**kwargs)
+        except (RateLimitError, APITimeoutError, APIConnectionError):
+            if attempt == MAX_RETRY_ATTEMPTS:
+                raise
+            await asyncio.sleep(random.uniform(1, min(60, 2 ** attempt)))
+
+
+class ChunkCache:
+    """
+    Per-chunk extraction results keyed by a blake2b hash of model, prompt and content
+    Repeated boilerplate (headers, footers, disclaimers) is sent to the model once;
+    with a path the results also persist across runs in a shelve file.
+
+    shelve has no concurrency control, so the file is guarded by an exclusive
+    lock on path + ".lock". A second process (or a platform without fcntl)
+    falls back to an in-memory cache instead of corrupting the file.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        self._shelf = None
+        self._lock_file = None
+        if path:
+            if self._acquire_lock(path + ".lock"):
+                self._shelf = shelve.open(path)
+            else:
+                print(f"      ⚠️ Chunk cache {path} is in use by another process; caching in memory only")
+
+    def _acquire_lock(self, lock_path: str) -> bool:
+        if not FCNTL_AVAILABLE:
+            return False
+        lock_file = open(lock_path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    @staticmethod
+    def key(chunk: str, model: str) -> str:
+        # Results depend on the model and prompt as much as on the chunk itself
+        payload = "\0".join((model, PROMPT_VERSION, chunk))
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if key in self._memory:
+            return self._memory[key]
+        if self._shelf is not None and key in self._shelf:
+            value = self._shelf[key]
+            self._memory[key] = value
+            return value
+        return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        self._memory[key] = value
+        if self._shelf is not None:
+            self._shelf[key] = value
+
+    def close(self) -> None:
+        if self._shelf is not None:
+            self._shelf.close()
+            self._shelf = None
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+def _dict_items(value: Any) -> List[Dict[str, Any]]:
+    """
+    Keep only the dict items of a model-returned list (anything else -> [])
+
+    Items whose "type" is present but not a string (e.g. a list) are dropped too:
+    the type becomes part of a dedupe key and a Neo4j label, so it must be hashable text.
+    """
+    if not isinstance(value, list):
+        return []
+    return [
+        item for item in value
+        if isinstance(item, dict) and isinstance(item.get("type", ""), str)
+    ]
+
+
+def dedupe_graph(
+    entities: List[Dict[str, Any]],
+    relationships: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Collapse duplicates extracted from different chunks before the Neo4j merge
+
+    Entities are keyed by (lowercased name, type) and relationships by
+    (lowercased source, lowercased target, type); properties of duplicates
+    are merged into the first occurrence.
+    Non-dict items and items whose name/source/target/type is not a string
+    are skipped, so malformed (or previously cached) model output can't raise.
+
+    Args:
+        entities: Raw extracted entities
+        relationships: Raw extracted relationships
+
+    Returns:
+        (entities, relationships) with first-seen order preserved
+    """
+    def merge(seen: Dict[Tuple, Dict[str, Any]], key: Tuple, item: Dict[str, Any]) -> None:
+        props = item.get("properties")
+        props = props if isinstance(props, dict) else {}
+        if key in seen:
+            seen[key]["properties"].update(props)
+        else:
+            seen[key] = {**item, "properties": dict(props)}
+
+    seen_entities: Dict[Tuple, Dict[str, Any]] = {}
+    for entity in entities:
+        if not isinstance(entity, dict):
+            continue
+        name = entity.get("name")
+        if not name or not isinstance(name, str):
+            continue
+        entity_type = entity.get("type", "")
+        if not isinstance(entity_type, str):
+            continue
+        merge(seen_entities, (name.strip().lower(), entity_type), entity)
+
+    seen_relationships: Dict[Tuple, Dict[str, Any]] = {}
+    for rel in relationships:
+        if not isinstance(rel, dict):
+            continue
+        source, target = rel.get("source"), rel.get("target")
+        if not source or not target or not isinstance(source, str) or not isinstance(target, str):
+            continue
+        rel_type = rel.get("type", "")
+        if not isinstance(rel_type, str):
+            continue
+        key = (source.strip().lower(), target.strip().lower(), rel_type)
+        merge(seen_relationships, key, rel)
+
+    return list(seen_entities.values()), list(seen_relationships.values())
+
+
+async def extract_graph_from_chunks(
+    client: AsyncOpenAI,
+    text: str,
+    ranges: List[Tuple[int, int]],
+    rate_limiter: Optional[RateLimiter] = None,
+    cache: Optional[ChunkCache] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    chunks_per_request: int = DEFAULT_CHUNKS_PER_REQUEST,
+    timeout_per_chunk: float = TIMEOUT_PER_CHUNK,
+    model: str = "gpt-4o-mini",
+    strict: bool = False
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Extract entities and relationships from all chunks concurrently
+
+    Chunks are packed into numbered sections, chunks_per_request per API call,
+    so the request count (and RPM pressure) drops by that factor. Chunks whose
+    content hash is already cached (or repeats earlier in this call) are not sent.
+
+    Args:
+        client: Shared AsyncOpenAI client
+        text: Full document text
+        ranges: (start, end) chunk offsets into text, e.g. from make_chunk_ranges
+        rate_limiter: Shared RPM/TPM limiter (None disables throttling)
+        cache: Shared ChunkCache (None uses a cache local to this call)
+        max_concurrency: Maximum in-flight API calls
+        chunks_per_request: Chunks packed into one prompt
+        timeout_per_chunk: Request timeout in seconds per packed chunk
+        model: OpenAI model name
+        strict: Raise instead of skipping failed batches and unanswered chunks
+
+    Returns:
+        Deduplicated (entities, relationships) in chunk order; failed batches are skipped
+
+    Raises:
+        RuntimeError: With strict, if any chunk has no extraction result
+    """
+    if cache is None:
+        cache = ChunkCache()
+
+    # Chunk strings are sliced from text only while hashing and when their batch is sent
+    keys = [ChunkCache.key(text[start:end], model) for start, end in ranges]
+    pending: Dict[str, Tuple[int, int]] = {}
+    for key, chunk_range in zip(keys, ranges):
+        if key not in pending and cache.get(key) is None:
+            pending[key] = chunk_range
+    if len(pending) < len(ranges):
+        print(f"      ♻️ {len(ranges) - len(pending)}/{len(ranges)} chunks reused from cache")
+
+    pending_items = list(pending.items())
+    batches = [
+        pending_items[i:i + chunks_per_request]
+        for i in range(0, len(pending_items), chunks_per_request)
+    ]
+    semaphore = asyncio.Semaphore(max_concurrency)
+    total = len(batches)
+    completed = 0
+
+    async def extract_batch(batch: List[Tuple[str, Tuple[int, int]]]) -> None:
+        nonlocal completed
+        async with semaphore:
+            try:
+                prompt = build_extraction_prompt([text[start:end] for _, (start, end) in batch])
+                max_tokens = MAX_TOKENS_PER_CHUNK * len(batch)
+                response = await _create_with_backoff(
+                    client,
+                    rate_limiter,
+                    estimate_tokens(SYSTEM_MESSAGE + prompt) + max_tokens,
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": SYSTEM_MESSAGE},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.1,
+                    max_tokens=max_tokens,
+                    # JSON mode: content is always a bare JSON object, no code fences to strip
+                    response_format={"type": "json_object"},
+                    timeout=timeout_per_chunk * len(batch)
+                )
+                data = loads_json(response.choices[0].message.content)
+                sections = data.get("results") if isinstance(data, dict) else None
+                answered = set()
+                for position, section in enumerate(sections if isinstance(sections, list) else []):
+                    if not isinstance(section, dict):
+                        continue
+                    section_id = section.get("id", position)
+                    if not isinstance(section_id, int) or not 0 <= section_id < len(batch):
+                        section_id = position
+                    if section_id >= len(batch) or section_id in answered:
+                        continue
+                    answered.add(section_id)
+                    # Only well-formed lists of objects are cached, so bad output can't be replayed
+                    cache.set(batch[section_id][0], {
+                        "entities": _dict_items(section.get("entities")),
+                        "relationships": _dict_items(section.get("relationships"))
+                    })
+                missing = [i for i in range(len(batch)) if i not in answered]
+                if missing:
+                    print(f"      ⚠️ Sections {missing} missing from response ({len(answered)}/{len(batch)} returned)")
+            finally:
+                completed += 1
+                if completed % 5 == 0 and completed < total:
+                    print(f"      Progress: {completed}/{total} requests ({completed * 100 // total}%)")
+
+    results = await asyncio.gather(
+        *(extract_batch(batch) for batch in batches),
+        return_exceptions=True
+    )
+    for i, result in enumerate(results, 1):
+        if isinstance(result, BaseException):
+            print(f"      ⚠️ Request {i} ({len(batches[i - 1])} chunks) extraction failed: {str(result)[:50]}")
+            if strict:
+                raise result
+
+    all_entities: List[Dict[str, Any]] = []
+    all_relationships: List[Dict[str, Any]] = []
+    for key in keys:
+        extracted = cache.get(key)
+        if extracted is None:
+            if strict:
+                raise RuntimeError(f"No extraction result for chunk {key}")
+            continue
+        all_entities.extend(extracted["entities"])
+        all_relationships.extend(extracted["relationships"])
+
+    return dedupe_graph(all_entities, all_relationships)
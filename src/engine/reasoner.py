@@ -8,7 +8,7 @@ from typing import Dict, List, Any, Tuple
 from openai import AsyncOpenAI
 from neo4j import GraphDatabase
 
-from config import OPENAI_API_KEY, OPENAI_BASE_URL, NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD
+from config import OPENAI_API_KEY, OPENAI_BASE_URL, NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD, NEO4J_DATABASE
 
 
 class MultiHopReasoner:
@@ -133,7 +133,7 @@ Now generate a query for the user's question."""
         """
         paths = []
         
-        with self.neo4j_driver.session() as session:
+        with self.neo4j_driver.session(database=NEO4J_DATABASE) as session:
             result = session.run(cypher)
             
             for record in result:
@@ -98,8 +98,10 @@ class SearchHandler:
             "Apple", "Meta", "Tesla"
         ]
         
+        query_lower = query.lower()
+        
         for company in public_companies:
-            if company.lower() in query.lower():
+            if company.lower() in query_lower:
                 entities["companies"].append(company)
         
         # Known public technologies
@@ -110,7 +112,7 @@ class SearchHandler:
         ]
         
         for tech in public_techs:
-            if tech.lower() in query.lower():
+            if tech.lower() in query_lower:
                 entities["technologies"].append(tech)
         
         return entities
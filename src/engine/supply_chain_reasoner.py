@@ -13,7 +13,7 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD, OPENAI_API_KEY, OPENAI_BASE_URL
+from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD, NEO4J_DATABASE, OPENAI_API_KEY, OPENAI_BASE_URL
 
 
 class SupplyChainReasoner:
@@ -85,7 +85,7 @@ class SupplyChainReasoner:
         LIMIT 20
         """
         
-        with self.driver.session() as session:
+        with self.driver.session(database=NEO4J_DATABASE) as session:
             result = session.run(query)
             paths = []
             
@@ -124,8 +124,9 @@ class EntityResolver:
                 return f"{english} ({korean})"
         
         # 영어 -> 한영 병기
+        entity_lower = entity_name.lower()
         for korean, english in self.korean_english_map.items():
-            if english.lower() in entity_name.lower():
+            if english.lower() in entity_lower:
                 return f"{english} ({korean})"
         
         return entity_name
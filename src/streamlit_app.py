@@ -329,7 +329,7 @@ with tab4:
                         else:
                             driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
 
-                            with driver.session() as session:
+                            with driver.session(database=os.getenv("NEO4J_DATABASE") or None) as session:
                                 # Get companies
                                 result = session.run("""
                                     MATCH (c:Company)
@@ -414,7 +414,7 @@ with tab4:
 
                 driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
 
-                with driver.session() as session:
+                with driver.session(database=os.getenv("NEO4J_DATABASE") or None) as session:
                     # Get nodes and relationships
                     query = f"""
                     MATCH (n)
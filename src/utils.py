@@ -307,9 +307,7 @@ def extract_text_from_pdf(pdf_path: str) -> str:
     try:
         import fitz  # PyMuPDF
         doc = fitz.open(pdf_path)
-        text = ""
-        for page in doc:
-            text += page.get_text()
+        text = "".join(page.get_text() for page in doc)
         doc.close()
         return text
     except ImportError:
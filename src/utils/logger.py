@@ -3,11 +3,84 @@ Structured logging utility for Finance GraphRAG
 Provides consistent, leveled logging with timestamps
 """
 
+import io
 import logging
+import os
 import sys
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler that batches records in a 64 KiB write buffer
+    Flushes on WARNING+ records and on close instead of after every record
+    """
+    
+    def __init__(
+        self,
+        filename: str,
+        mode: str = 'a',
+        encoding: Optional[str] = 'utf-8',
+        buffer_size: int = 65536,
+        flush_level: int = logging.WARNING
+    ):
+        self.buffer_size = buffer_size
+        self.flush_level = flush_level
+        super().__init__(filename, mode, encoding)
+    
+    def _open(self):
+        """
+        Open the log file as a raw O_APPEND fd behind a binary block buffer
+        O_APPEND keeps each flushed batch atomic at the end of the file
+        """
+        flags = os.O_WRONLY | os.O_CREAT | getattr(os, 'O_CLOEXEC', 0)
+        flags |= os.O_TRUNC if 'w' in self.mode else os.O_APPEND
+        fd = os.open(self.baseFilename, flags, 0o644)
+        raw = io.FileIO(fd, 'w', closefd=True)
+        return io.BufferedWriter(raw, buffer_size=self.buffer_size)
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write record to the buffer; flush only for important records"""
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            message = self.format(record) + self.terminator
+            self.stream.write(message.encode(self.encoding))
+            if record.levelno >= self.flush_level:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class FastFormatter(logging.Formatter):
+    """
+    Formatter that reuses the formatted timestamp for records in the same second
+    Only the millisecond suffix is rebuilt per record
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_time = (None, '')
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        """Format record time, caching the strftime result per second"""
+        second = int(record.created)
+        cached_second, cached_str = self._cached_time
+        if second != cached_second:
+            cached_str = time.strftime(
+                datefmt or self.default_time_format,
+                self.converter(second)
+            )
+            self._cached_time = (second, cached_str)
+        if datefmt:
+            return cached_str
+        return self.default_msec_format % (cached_str, record.msecs)
 
 
 class StructuredLogger:
@@ -25,6 +98,7 @@ class StructuredLogger:
         self.logger = logging.getLogger(name)
         self.logger.setLevel(level)
         self.logger.handlers.clear()
+        self._refresh_level_flags()
         
         # Console handler (user-friendly format)
         console_handler = logging.StreamHandler(sys.stdout)
@@ -40,37 +114,51 @@ class StructuredLogger:
             log_path = Path(log_file)
             log_path.parent.mkdir(parents=True, exist_ok=True)
             
-            file_handler = logging.FileHandler(log_file)
+            file_handler = BufferedFileHandler(log_file)
             file_handler.setLevel(logging.DEBUG)
-            file_formatter = logging.Formatter(
+            file_formatter = FastFormatter(
                 '%(asctime)s | %(levelname)s | %(name)s | %(funcName)s:%(lineno)d | %(message)s'
             )
             file_handler.setFormatter(file_formatter)
             self.logger.addHandler(file_handler)
     
-    def info(self, message: str) -> None:
-        """Log info level message"""
-        self.logger.info(message)
+    def set_level(self, level: int) -> None:
+        """Change logger level and refresh the cached level checks"""
+        self.logger.setLevel(level)
+        self._refresh_level_flags()
+    
+    def _refresh_level_flags(self) -> None:
+        """Cache isEnabledFor results so disabled debug/info calls return early"""
+        self._debug_on = self.logger.isEnabledFor(logging.DEBUG)
+        self._info_on = self.logger.isEnabledFor(logging.INFO)
+    
+    def info(self, message: str, *args) -> None:
+        """Log info level message (args are %-formatted lazily)"""
+        if self._info_on:
+            self.logger.info(message, *args)
     
-    def warning(self, message: str) -> None:
+    def warning(self, message: str, *args) -> None:
         """Log warning level message"""
-        self.logger.warning(message)
+        self.logger.warning(message, *args)
     
-    def error(self, message: str, exc_info: bool = False) -> None:
+    def error(self, message: str, *args, exc_info: bool = False) -> None:
         """Log error level message"""
-        self.logger.error(message, exc_info=exc_info)
+        self.logger.error(message, *args, exc_info=exc_info)
     
-    def debug(self, message: str) -> None:
-        """Log debug level message"""
-        self.logger.debug(message)
+    def debug(self, message: str, *args) -> None:
+        """Log debug level message (args are %-formatted lazily)"""
+        if self._debug_on:
+            self.logger.debug(message, *args)
     
-    def critical(self, message: str, exc_info: bool = True) -> None:
+    def critical(self, message: str, *args, exc_info: bool = True) -> None:
         """Log critical level message"""
-        self.logger.critical(message, exc_info=exc_info)
+        self.logger.critical(message, *args, exc_info=exc_info)
 
 
-# Singleton logger instances
-_loggers: dict[str, StructuredLogger] = {}
+# One StructuredLogger per name: construction clears the underlying logging.Logger's
+# handlers, so a second instance for the same name would detach the first one's
+_loggers: Dict[str, StructuredLogger] = {}
+_loggers_lock = threading.Lock()
 
 
 def get_logger(name: str, log_file: Optional[str] = None) -> StructuredLogger:
@@ -82,8 +170,12 @@ def get_logger(name: str, log_file: Optional[str] = None) -> StructuredLogger:
         log_file: Optional log file path
     
     Returns:
-        StructuredLogger instance
+        StructuredLogger instance (log_file only applies on first creation)
     """
-    if name not in _loggers:
-        _loggers[name] = StructuredLogger(name, log_file)
-    return _loggers[name]
+    logger = _loggers.get(name)
+    if logger is None:
+        with _loggers_lock:
+            logger = _loggers.get(name)
+            if logger is None:
+                logger = _loggers[name] = StructuredLogger(name, log_file)
+    return logger
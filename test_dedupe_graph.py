@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+dedupe_graph 오프라인 테스트 (Neo4j/OpenAI 호출 없음)
+모델이 잘못된 type(list/dict 등)을 돌려줘도 예외 없이 정리되는지 확인
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from engine.openai_graph_extractor import _dict_items, dedupe_graph
+
+
+def main():
+    print("=" * 70)
+    print("🧪 dedupe_graph 잘못된 type 처리 테스트")
+    print("=" * 70)
+
+    raw_entities = [
+        {"name": "TSMC", "type": "COMPANY", "properties": {"country": "TW"}},
+        {"name": "tsmc ", "type": "COMPANY", "properties": {"ticker": "TSM"}},
+        {"name": "Nvidia", "type": ["COMPANY", "PRODUCT"]},
+        {"name": "ASML", "type": {"label": "COMPANY"}},
+        {"name": "Samsung"},
+        "not-a-dict"
+    ]
+    raw_relationships = [
+        {"source": "TSMC", "target": "Nvidia", "type": "SUPPLIES"},
+        {"source": "tsmc", "target": "NVIDIA", "type": "SUPPLIES", "properties": {"since": 2020}},
+        {"source": "ASML", "target": "TSMC", "type": ["SUPPLIES"]},
+        {"source": "ASML", "target": "TSMC", "type": None}
+    ]
+
+    # 1. dedupe_graph가 원본(캐시에 이미 저장된 값일 수 있음)을 받아도 예외가 없어야 함
+    entities, relationships = dedupe_graph(raw_entities, raw_relationships)
+    assert [(e["name"], e.get("type")) for e in entities] == [("TSMC", "COMPANY"), ("Samsung", None)], entities
+    assert entities[0]["properties"] == {"country": "TW", "ticker": "TSM"}
+    assert len(relationships) == 1 and relationships[0]["properties"] == {"since": 2020}, relationships
+    print("   ✅ dedupe_graph: 잘못된 type 항목 건너뜀, 중복 병합 정상")
+
+    # 2. 캐시에 저장되기 전 단계에서 잘못된 type이 걸러져야 함
+    cleaned = _dict_items(raw_entities)
+    assert [e["name"] for e in cleaned] == ["TSMC", "tsmc ", "Samsung"], cleaned
+    assert _dict_items(raw_relationships) == raw_relationships[:2]
+    assert _dict_items("oops") == []
+    print("   ✅ _dict_items: 캐시 저장 전 잘못된 type 제거")
+
+    print("\n✅ 테스트 성공!")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,9 +8,22 @@ import requests
 import json
 import time
 import sys
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 BASE_URL = "http://localhost:8000"
 
+# Shared HTTP session (keep-alive across all test requests)
+SESSION = requests.Session()
+SESSION.mount(
+    "http://",
+    HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=8,
+        max_retries=Retry(total=2, backoff_factor=0.1)
+    )
+)
+
 def print_section(title):
     """Print formatted section header"""
     print("\n" + "=" * 70)
@@ -23,7 +36,7 @@ def test_health_check():
     print_section("Test 1: Health Check")
     
     try:
-        response = requests.get(f"{BASE_URL}/health", timeout=5)
+        response = SESSION.get(f"{BASE_URL}/health", timeout=5)
         data = response.json()
         
         print(f"✅ Status: {response.status_code}")
@@ -43,7 +56,7 @@ def test_graph_stats():
     print_section("Test 2: Graph Statistics")
     
     try:
-        response = requests.get(f"{BASE_URL}/graph_stats", timeout=5)
+        response = SESSION.get(f"{BASE_URL}/graph_stats", timeout=5)
         data = response.json()
         
         print(f"✅ Status: {response.status_code}")
@@ -69,7 +82,7 @@ def test_insert_endpoint():
         # Test inserting text
         text = "Nvidia announced new Blackwell GPU architecture in 2026."
         
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/insert",
             json={"text": text},
             timeout=30
@@ -94,7 +107,7 @@ def test_query_endpoint():
         query = "What is Nvidia?"
         
         print(f"   Query: {query}")
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/query",
             json={
                 "question": query,
@@ -129,7 +142,7 @@ def test_agentic_query():
         query = "What are Nvidia's key products?"
         
         print(f"   Query: {query}")
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/agentic-query",
             json={
                 "question": query,
@@ -163,7 +176,7 @@ def test_web_search_query():
         print(f"   Query: {query}")
         print(f"   (This should trigger Perplexity web search)")
         
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/query",
             json={
                 "question": query,
@@ -193,7 +206,7 @@ def test_graph_visualization():
     print_section("Test 7: Graph Visualization")
     
     try:
-        response = requests.get(f"{BASE_URL}/visualize", timeout=10)
+        response = SESSION.get(f"{BASE_URL}/visualize", timeout=10)
         
         print(f"✅ Status: {response.status_code}")
         
@@ -220,7 +233,7 @@ def test_streamlit_frontend():
     
     try:
         # Check if Streamlit is running on default port 8501
-        response = requests.get("http://localhost:8501", timeout=5)
+        response = SESSION.get("http://localhost:8501", timeout=5)
         
         if response.status_code == 200:
             print(f"✅ Streamlit is running on http://localhost:8501")
@@ -289,7 +302,10 @@ if __name__ == "__main__":
     print(f"Backend URL: {BASE_URL}")
     
     # Run all tests
-    success = generate_report()
+    try:
+        success = generate_report()
+    finally:
+        SESSION.close()
     
     # Exit with appropriate code
     sys.exit(0 if success else 1)
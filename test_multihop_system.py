@@ -5,6 +5,7 @@ Tests integrator, reasoner, and end-to-end workflow
 
 import asyncio
 import json
+import logging
 from pathlib import Path
 import sys
 
@@ -14,6 +15,8 @@ sys.path.append(str(Path(__file__).parent / 'src'))
 from engine.integrator import DataIntegrator, EntityResolver
 from engine.reasoner import MultiHopReasoner
 
+log = logging.getLogger(__name__)
+
 
 def test_entity_resolver():
     """Test 1: Entity name resolution"""
@@ -137,9 +140,7 @@ async def test_reasoner():
         return True
         
     except Exception as e:
-        print(f"❌ Reasoner test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("❌ Reasoner test failed: %s", e)
         reasoner.close()
         return False
 
@@ -154,28 +155,32 @@ async def test_end_to_end():
     print("\n1️⃣  Creating sample data...")
     integrator = DataIntegrator()
     
-    # Companies
-    integrator.merge_entity('Nvidia', 'Company', {'revenue': 60.9, 'market_cap': 1200})
-    integrator.merge_entity('Intel', 'Company', {'revenue': 54.2, 'market_cap': 180})
-    integrator.merge_entity('TSMC', 'Company', {'revenue': 69.3, 'market_cap': 550})
-    
-    # Countries
-    integrator.merge_entity('Taiwan', 'Country', {'region': 'Asia'})
-    integrator.merge_entity('USA', 'Country', {'region': 'North America'})
-    
-    # Industries
-    integrator.merge_entity('Semiconductor', 'Industry', {})
-    
-    # Macro indicators
-    integrator.merge_entity('Taiwan Strait Tension', 'MacroIndicator', {'type': 'geopolitical', 'severity': 0.95})
-    integrator.merge_entity('US-China Trade War', 'MacroIndicator', {'type': 'geopolitical', 'severity': 0.85})
+    # Entities (one UNWIND query per label)
+    integrator.merge_entities_bulk('Company', [
+        {'name': 'Nvidia', 'props': {'revenue': 60.9, 'market_cap': 1200}},
+        {'name': 'Intel', 'props': {'revenue': 54.2, 'market_cap': 180}},
+        {'name': 'TSMC', 'props': {'revenue': 69.3, 'market_cap': 550}},
+    ])
+    integrator.merge_entities_bulk('Country', [
+        {'name': 'Taiwan', 'props': {'region': 'Asia'}},
+        {'name': 'USA', 'props': {'region': 'North America'}},
+    ])
+    integrator.merge_entities_bulk('Industry', [
+        {'name': 'Semiconductor', 'props': {}},
+    ])
+    integrator.merge_entities_bulk('MacroIndicator', [
+        {'name': 'Taiwan Strait Tension', 'props': {'type': 'geopolitical', 'severity': 0.95}},
+        {'name': 'US-China Trade War', 'props': {'type': 'geopolitical', 'severity': 0.85}},
+    ])
     
-    # Relationships
-    integrator.create_relationship('Nvidia', 'TSMC', 'DEPENDS_ON', {'criticality': 0.9})
-    integrator.create_relationship('Nvidia', 'Semiconductor', 'OPERATES_IN', {})
-    integrator.create_relationship('TSMC', 'Taiwan', 'LOCATED_IN', {})
-    integrator.create_relationship('Taiwan Strait Tension', 'Taiwan', 'THREATENS', {'probability': 0.7})
-    integrator.create_relationship('US-China Trade War', 'Semiconductor', 'IMPACTS', {'severity': 0.8})
+    # Relationships (one UNWIND query per type)
+    integrator.create_relationships_bulk([
+        {'a': 'Nvidia', 'b': 'TSMC', 'type': 'DEPENDS_ON', 'props': {'criticality': 0.9}},
+        {'a': 'Nvidia', 'b': 'Semiconductor', 'type': 'OPERATES_IN', 'props': {}},
+        {'a': 'TSMC', 'b': 'Taiwan', 'type': 'LOCATED_IN', 'props': {}},
+        {'a': 'Taiwan Strait Tension', 'b': 'Taiwan', 'type': 'THREATENS', 'props': {'probability': 0.7}},
+        {'a': 'US-China Trade War', 'b': 'Semiconductor', 'type': 'IMPACTS', 'props': {'severity': 0.8}},
+    ])
     
     print("✅ Sample data created")
     integrator.close()
@@ -190,10 +195,13 @@ async def test_end_to_end():
         "How does US-China trade war impact semiconductor companies?"
     ]
     
-    for i, question in enumerate(questions, 1):
+    # Questions are independent, so reason over them concurrently
+    results = await asyncio.gather(
+        *(reasoner.reason(question, max_hops=3) for question in questions)
+    )
+    
+    for i, (question, result) in enumerate(zip(questions, results), 1):
         print(f"\n   Question {i}: {question}")
-        result = await reasoner.reason(question, max_hops=3)
-        
         print(f"   💡 Inference: {result['inference'][:80]}...")
         print(f"   📊 Confidence: {result['confidence']:.1%}")
         print(f"   🔗 Paths: {len(result['reasoning_paths'])}")
@@ -227,9 +235,7 @@ async def main():
                 result = test_func()
             results.append((name, result))
         except Exception as e:
-            print(f"\n❌ {name} test crashed: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("\n❌ %s test crashed: %s", name, e)
             results.append((name, False))
     
     # Summary
@@ -5,8 +5,8 @@
 
 import os
 import sys
-import json
 import asyncio
+import traceback
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -52,67 +52,39 @@ async def test_upload_pdf():
         import pymupdf
         from openai import AsyncOpenAI
         from engine.integrator import DataIntegrator
+        from engine.openai_graph_extractor import extract_graph_from_chunks
         
         # 1. 텍스트 추출
         print("\n1️⃣ PDF 텍스트 추출 중...")
-        doc = pymupdf.open(str(test_pdf))
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        doc.close()
+        # 첫 청크(3000자)만 사용하므로 그만큼 모이면 추출 중단
+        parts = []
+        total_chars = 0
+        with pymupdf.open(str(test_pdf)) as doc:
+            for page in doc:
+                page_text = page.get_text()
+                parts.append(page_text)
+                total_chars += len(page_text)
+                if total_chars >= 3000:
+                    break
+        text = "".join(parts)
         
         print(f"   ✅ {len(text)} 문자 추출")
         
         # 2. OpenAI로 엔티티 추출 (1개 청크만)
         print("\n2️⃣ OpenAI GPT-4o-mini로 엔티티 추출 중...")
-        client = AsyncOpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL)
+        client = AsyncOpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL, max_retries=0)  # 재시도는 _create_with_backoff에서만
         
-        chunk = text[:3000]  # 첫 3000자만
+        # 업로드 스크립트와 같은 프롬프트/파싱 경로로 첫 3000자 한 청크만 추출
+        # strict=True: 요청 실패/응답 누락 시 빈 결과 대신 예외로 테스트 실패
+        try:
+            entities, relationships = await extract_graph_from_chunks(
+                client, text, [(0, min(len(text), 3000))], strict=True
+            )
+        finally:
+            await client.close()
         
-        prompt = f"""Extract business entities and relationships from this semiconductor/financial text.
-Return ONLY valid JSON format:
-
-{{
-  "entities": [
-    {{"name": "EntityName", "type": "COMPANY|PERSON|PRODUCT|TECHNOLOGY|FINANCIAL_METRIC|LOCATION|REGULATION|RISK", "properties": {{"key": "value"}}}}
-  ],
-  "relationships": [
-    {{"source": "EntityA", "target": "EntityB", "type": "RELATIONSHIP_TYPE", "properties": {{"key": "value"}}}}
-  ]
-}}
-
-Entity types: COMPANY, PERSON, PRODUCT, TECHNOLOGY, FINANCIAL_METRIC, LOCATION, REGULATION, RISK, MARKET, SUPPLY_CHAIN
-Relationship types: SUPPLIES, PURCHASES, COMPETES_WITH, HAS_CEO, EMPLOYS, LOCATED_IN, PRODUCES, IMPACTS, DEPENDS_ON, REGULATES
-
-Text:
-{chunk}
-
-JSON output:"""
-        
-        response = await client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a financial document analyzer. Extract structured entities and relationships. Respond with valid JSON only."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.1,
-            max_tokens=2000
-        )
-        
-        content = response.choices[0].message.content.strip()
-        
-        # JSON 파싱
-        if content.startswith("```json"):
-            content = content[7:]
-        if content.startswith("```"):
-            content = content[3:]
-        if content.endswith("```"):
-            content = content[:-3]
-        content = content.strip()
-        
-        extracted = json.loads(content)
-        entities = extracted.get("entities", [])
-        relationships = extracted.get("relationships", [])
+        if not entities:
+            raise RuntimeError("추출된 엔티티가 없습니다")
         
         print(f"   ✅ {len(entities)} 엔티티, {len(relationships)} 관계 추출")
         
@@ -142,13 +114,13 @@ JSON output:"""
         
         # 4. 저장 확인
         print("\n4️⃣ 저장 확인 중...")
-        verify_query = f"""
+        verify_query = """
         MATCH (n)
-        WHERE n.source_file = '{test_pdf.name}'
+        WHERE n.source_file = $source_file
         RETURN count(n) as count
         """
         
-        result = db.execute_query(verify_query)
+        result = db.execute_query(verify_query, {"source_file": test_pdf.name})
         stored_count = result[0]['count'] if result else 0
         
         print(f"   ✅ Neo4j에 저장된 노드 수: {stored_count}")
@@ -161,9 +133,9 @@ JSON output:"""
         
     except Exception as e:
         print(f"\n❌ 에러 발생: {e}")
-        import traceback
         traceback.print_exc()
         db.close()
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -18,26 +18,85 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from db.neo4j_db import Neo4jDatabase
-from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD, OPENAI_API_KEY, OPENAI_BASE_URL
+from config import (
+    NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD, OPENAI_API_KEY, OPENAI_BASE_URL,
+    OPENAI_RPM_LIMIT, OPENAI_TPM_LIMIT
+)
+
+# UNWIND 쿼리 한 번에 보낼 최대 행 수
+UNWIND_BATCH_SIZE = 1000
+
+# 청크 추출 결과 디스크 캐시 (upload_baseline_pdfs.py와 공유)
+CHUNK_CACHE_PATH = str(Path(__file__).parent / '.chunk_cache')
+
+# PDF당 최대 30개 청크만 처리 (비용 절감), 청크당 ~3000자
+MAX_CHUNKS = 30
+CHUNK_CHARS = 3000
+# 어차피 버릴 텍스트는 추출하지 않음
+MAX_TEXT_CHARS = MAX_CHUNKS * CHUNK_CHARS
+
+
+def ensure_indexes(db: Neo4jDatabase):
+    """
+    MERGE 대상 라벨의 name 인덱스/제약조건 생성
+    인덱스가 없으면 MERGE마다 라벨 전체를 스캔해요
+    """
+    from engine.integrator import DataIntegrator
+    
+    try:
+        db.execute_query(
+            "CREATE CONSTRAINT company_name IF NOT EXISTS "
+            "FOR (c:Company) REQUIRE c.name IS UNIQUE"
+        )
+    except Exception as e:
+        # 기존 데이터에 중복 이름이 있으면 제약조건 대신 일반 인덱스 사용
+        print(f"⚠️ Company 제약조건 생성 실패, 인덱스로 대체: {str(e)[:100]}")
+        db.execute_query(
+            "CREATE INDEX company_name_index IF NOT EXISTS "
+            "FOR (c:Company) ON (c.name)"
+        )
+    
+    # ingestPdfGraph가 생성하는 엔티티 라벨들
+    labels = set(DataIntegrator.ENTITY_TYPE_LABELS.values()) | {"Entity"}
+    for label in sorted(labels - {"Company"}):
+        db.execute_query(
+            f"CREATE INDEX {label.lower()}_name IF NOT EXISTS "
+            f"FOR (n:{label}) ON (n.name)"
+        )
+    
+    print(f"✅ 인덱스 준비 완료: Company + {len(labels) - 1}개 엔티티 라벨")
+
 
 def upload_json_file(db: Neo4jDatabase, json_path: str):
     """JSON 파일을 Neo4j에 업로드"""
+    
     print(f"\n📦 Processing: {json_path}")
     
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # orjson이 있으면 더 빠르게 파싱 (없으면 표준 json)
+    if ORJSON_AVAILABLE:
+        with open(json_path, 'rb') as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
     
     # supply_chain_mapping.json 처리
     if 'supply_chain' in data:
         supply_chain = data['supply_chain']
         tiers = supply_chain.get('tiers', [])
         
-        nodes_created = 0
-        relationships_created = 0
+        companies = []
+        dependencies = []
         
         for tier in tiers:
             tier_num = tier.get('tier')
@@ -45,19 +104,7 @@ def upload_json_file(db: Neo4jDatabase, json_path: str):
             
             for company in tier.get('companies', []):
                 company_name = company.get('name')
-                
-                # Company 노드 생성
-                query = """
-                MERGE (c:Company {name: $name})
-                SET c.tier = $tier,
-                    c.tier_name = $tier_name,
-                    c.role = $role,
-                    c.criticality = $criticality,
-                    c.location = $location
-                RETURN c
-                """
-                
-                db.execute_query(query, {
+                companies.append({
                     'name': company_name,
                     'tier': tier_num,
                     'tier_name': tier_name,
@@ -65,22 +112,38 @@ def upload_json_file(db: Neo4jDatabase, json_path: str):
                     'criticality': company.get('criticality', 'medium'),
                     'location': company.get('location', '')
                 })
-                nodes_created += 1
                 
-                # Dependencies (관계) 생성
                 for dep in company.get('dependencies', []):
-                    dep_query = """
-                    MATCH (c1:Company {name: $company})
-                    MERGE (c2:Company {name: $dependency})
-                    MERGE (c1)-[r:DEPENDS_ON]->(c2)
-                    RETURN r
-                    """
-                    
-                    db.execute_query(dep_query, {
+                    dependencies.append({
                         'company': company_name,
                         'dependency': dep
                     })
-                    relationships_created += 1
+        
+        # Company 노드 생성 (UNWIND 배치)
+        company_query = """
+        UNWIND $rows AS r
+        MERGE (c:Company {name: r.name})
+        SET c.tier = r.tier,
+            c.tier_name = r.tier_name,
+            c.role = r.role,
+            c.criticality = r.criticality,
+            c.location = r.location
+        """
+        for i in range(0, len(companies), UNWIND_BATCH_SIZE):
+            db.execute_query(company_query, {'rows': companies[i:i + UNWIND_BATCH_SIZE]})
+        
+        # Dependencies (관계) 생성 (UNWIND 배치)
+        dep_query = """
+        UNWIND $rows AS r
+        MATCH (c1:Company {name: r.company})
+        MERGE (c2:Company {name: r.dependency})
+        MERGE (c1)-[:DEPENDS_ON]->(c2)
+        """
+        for i in range(0, len(dependencies), UNWIND_BATCH_SIZE):
+            db.execute_query(dep_query, {'rows': dependencies[i:i + UNWIND_BATCH_SIZE]})
+        
+        nodes_created = len(companies)
+        relationships_created = len(dependencies)
         
         print(f"✅ Created {nodes_created} nodes and {relationships_created} relationships")
         return nodes_created, relationships_created
@@ -88,143 +151,171 @@ def upload_json_file(db: Neo4jDatabase, json_path: str):
     return 0, 0
 
 
-async def upload_pdf_file_with_openai(pdf_path: str, db: Neo4jDatabase):
+def extract_pdf_text(pdf_path: str, max_chars: int = MAX_TEXT_CHARS) -> str:
     """
-    OpenAI API를 사용하여 PDF를 처리하고 Neo4j에 영구 저장
+    PDF에서 텍스트 추출 (프로세스 풀 워커에서 실행)
     
     Args:
         pdf_path: PDF 파일 경로
-        db: Neo4j 데이터베이스 인스턴스
+        max_chars: 이만큼 추출하면 남은 페이지는 건너뜀
         
     Returns:
-        처리 결과 딕셔너리
+        추출된 텍스트
     """
-    print(f"\n📄 Processing PDF with OpenAI: {os.path.basename(pdf_path)}")
+    import pymupdf
     
-    try:
-        import pymupdf
-        from openai import AsyncOpenAI
-        
-        # 1. PDF에서 텍스트 추출
-        doc = pymupdf.open(pdf_path)
-        text = ""
+    # 페이지 텍스트를 리스트에 모아 한 번에 join (+= 누적은 O(n²) 복사)
+    parts = []
+    total_chars = 0
+    with pymupdf.open(pdf_path) as doc:
         for page in doc:
-            text += page.get_text()
-        doc.close()
-        
-        if not text or len(text.strip()) < 10:
-            print(f"⚠️ PDF contains no extractable text")
-            return None
-        
-        print(f"  ✅ Extracted {len(text)} characters from PDF")
-        
-        # 2. OpenAI로 엔티티 및 관계 추출
-        client = AsyncOpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL)
-        
-        chunk_size = 3000  # 큰 청크로 처리 (OpenAI는 컨텍스트가 크므로)
-        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
-        
-        # 최대 30개 청크만 처리 (비용 절감)
-        max_chunks = 30
-        if len(chunks) > max_chunks:
-            print(f"  ⚠️ Limiting to first {max_chunks} chunks (out of {len(chunks)})")
-            chunks = chunks[:max_chunks]
-        
-        all_entities = []
-        all_relationships = []
-        
-        print(f"  🤖 Processing {len(chunks)} chunks with GPT-4o-mini...")
+            page_text = page.get_text()
+            parts.append(page_text)
+            total_chars += len(page_text)
+            if total_chars >= max_chars:
+                break
+    return "".join(parts)
+
+
+async def extract_pdf_graph(text: str, client, rate_limiter, chunk_cache):
+    """
+    OpenAI로 텍스트에서 엔티티 및 관계 추출
+    
+    Args:
+        text: PDF 전체 텍스트
+        client: 모든 PDF가 공유하는 AsyncOpenAI 클라이언트
+        rate_limiter: 모든 PDF가 공유하는 RateLimiter
+        chunk_cache: 모든 PDF가 공유하는 ChunkCache
         
-        for i, chunk in enumerate(chunks):
-            if i > 0 and i % 5 == 0:
-                print(f"    Progress: {i}/{len(chunks)} chunks ({i*100//len(chunks)}%)")
-            
-            prompt = f"""Extract business entities and relationships from this semiconductor/financial text.
-Return ONLY valid JSON format:
+    Returns:
+        (entities, relationships)
+    """
+    from engine.openai_graph_extractor import extract_graph_from_chunks, make_chunk_ranges
+    
+    # 문단 경계를 지키는 토큰 기준 청크 (~3000자), 문자열 대신 (start, end) 오프셋만 보관
+    ranges = make_chunk_ranges(text)
+    
+    if len(ranges) > MAX_CHUNKS:
+        print(f"  ⚠️ Limiting to first {MAX_CHUNKS} chunks (out of {len(ranges)})")
+        ranges = ranges[:MAX_CHUNKS]
+    
+    print(f"  🤖 Processing {len(ranges)} chunks with GPT-4o-mini...")
+    
+    # 청크들을 동시에 요청 (Semaphore로 동시 요청 수 제한)
+    return await extract_graph_from_chunks(client, text, ranges, rate_limiter, chunk_cache)
 
-{{
-  "entities": [
-    {{"name": "EntityName", "type": "COMPANY|PERSON|PRODUCT|TECHNOLOGY|FINANCIAL_METRIC|LOCATION|REGULATION|RISK", "properties": {{"key": "value"}}}}
-  ],
-  "relationships": [
-    {{"source": "EntityA", "target": "EntityB", "type": "RELATIONSHIP_TYPE", "properties": {{"key": "value"}}}}
-  ]
-}}
 
-Entity types: COMPANY, PERSON, PRODUCT, TECHNOLOGY, FINANCIAL_METRIC, LOCATION, REGULATION, RISK, MARKET, SUPPLY_CHAIN
-Relationship types: SUPPLIES, PURCHASES, COMPETES_WITH, HAS_CEO, EMPLOYS, LOCATED_IN, PRODUCES, IMPACTS, DEPENDS_ON, REGULATES
+def write_pdf_graph(integrator, pdf_path: str, all_entities, all_relationships):
+    """
+    추출된 그래프를 Neo4j에 병합
+    
+    Args:
+        integrator: 모든 PDF가 공유하는 DataIntegrator
+        pdf_path: PDF 파일 경로
+        all_entities: 추출된 엔티티
+        all_relationships: 추출된 관계
+        
+    Returns:
+        ingestPdfGraph 병합 통계
+    """
+    return integrator.ingestPdfGraph(
+        graphData={
+            "entities": all_entities,
+            "relationships": all_relationships
+        },
+        sourceFile=os.path.basename(pdf_path),
+        sourceLabel=Path(pdf_path).stem
+    )
 
-Text:
-{chunk[:3000]}
 
-JSON output:"""
+async def upload_pdfs_pipelined(pdf_files, integrator, client, rate_limiter, chunk_cache, queue_size: int = 2):
+    """
+    PDF 업로드 3단계 파이프라인
+    텍스트 추출(프로세스 풀) → OpenAI 추출 → Neo4j 병합이 파일 간에 겹쳐서 실행돼요
+    (PDF N+1 텍스트 추출 / PDF N OpenAI 호출 / PDF N-1 Neo4j 병합)
+    
+    Args:
+        pdf_files: PDF 파일 경로 목록
+        integrator: 모든 PDF가 공유하는 DataIntegrator
+        client: 모든 PDF가 공유하는 AsyncOpenAI 클라이언트
+        rate_limiter: 모든 PDF가 공유하는 RateLimiter
+        chunk_cache: 모든 PDF가 공유하는 ChunkCache
+        queue_size: 단계 사이 큐 크기
+        
+    Returns:
+        처리 결과 딕셔너리 목록
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    
+    text_q: asyncio.Queue = asyncio.Queue()
+    extract_q: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    write_q: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    results = []
+    
+    for pdf_file in pdf_files:
+        text_q.put_nowait(str(pdf_file))
+    text_q.put_nowait(None)
+    
+    async def extractor(executor):
+        loop = asyncio.get_running_loop()
+        while (pdf_path := await text_q.get()) is not None:
+            try:
+                text = await loop.run_in_executor(executor, extract_pdf_text, pdf_path)
+            except Exception as e:
+                print(f"  ❌ Error extracting {os.path.basename(pdf_path)}: {e}")
+                continue
             
+            if not text or len(text.strip()) < 10:
+                print(f"⚠️ PDF contains no extractable text: {os.path.basename(pdf_path)}")
+                continue
+            
+            print(f"\n📄 Extracted {len(text)} characters from {os.path.basename(pdf_path)}")
+            await extract_q.put((pdf_path, text))
+        await extract_q.put(None)
+    
+    async def llm_worker():
+        while (item := await extract_q.get()) is not None:
+            pdf_path, text = item
+            print(f"\n📄 Processing PDF with OpenAI: {os.path.basename(pdf_path)}")
             try:
-                response = await client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {"role": "system", "content": "You are a financial document analyzer. Extract structured entities and relationships. Respond with valid JSON only."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.1,
-                    max_tokens=2000
+                all_entities, all_relationships = await extract_pdf_graph(text, client, rate_limiter, chunk_cache)
+            except Exception as e:
+                print(f"  ❌ Error processing PDF: {e}")
+                continue
+            
+            print(f"  ✅ Extracted {len(all_entities)} entities, {len(all_relationships)} relationships")
+            await write_q.put((pdf_path, len(text), all_entities, all_relationships))
+        await write_q.put(None)
+    
+    async def writer():
+        while (item := await write_q.get()) is not None:
+            pdf_path, text_length, all_entities, all_relationships = item
+            try:
+                # 동기 드라이버 호출은 스레드에서 실행해 OpenAI 호출을 막지 않음
+                merge_stats = await asyncio.to_thread(
+                    write_pdf_graph, integrator, pdf_path, all_entities, all_relationships
                 )
-                
-                content = response.choices[0].message.content.strip()
-                
-                # Parse JSON from response
-                if content.startswith("```json"):
-                    content = content[7:]
-                if content.startswith("```"):
-                    content = content[3:]
-                if content.endswith("```"):
-                    content = content[:-3]
-                content = content.strip()
-                
-                extracted = json.loads(content)
-                all_entities.extend(extracted.get("entities", []))
-                all_relationships.extend(extracted.get("relationships", []))
-                
             except Exception as e:
-                print(f"    ⚠️ Chunk {i} extraction failed: {e}")
+                print(f"  ❌ Error merging {os.path.basename(pdf_path)}: {e}")
+                import traceback
+                traceback.print_exc()
                 continue
-        
-        print(f"  ✅ Extracted {len(all_entities)} entities, {len(all_relationships)} relationships")
-        
-        # 3. Neo4j에 저장
-        from engine.integrator import DataIntegrator
-        
-        integrator = DataIntegrator()
-        graph_data = {
-            "entities": all_entities,
-            "relationships": all_relationships
-        }
-        
-        source_file = os.path.basename(pdf_path)
-        source_label = Path(pdf_path).stem
-        
-        merge_stats = integrator.ingestPdfGraph(
-            graphData=graph_data,
-            sourceFile=source_file,
-            sourceLabel=source_label
-        )
-        integrator.close()
-        
-        print(f"  ✅ Merged into Neo4j: {merge_stats.get('entitiesMerged', 0)} entities, {merge_stats.get('relationshipsCreated', 0)} relationships")
-        
-        return {
-            'text_length': len(text),
-            'entities_extracted': len(all_entities),
-            'relationships_extracted': len(all_relationships),
-            'merge_stats': merge_stats,
-            'source_file': source_file
-        }
+            
+            print(f"  ✅ Merged {os.path.basename(pdf_path)} into Neo4j: {merge_stats.get('entitiesMerged', 0)} entities, {merge_stats.get('relationshipsCreated', 0)} relationships")
+            results.append({
+                'text_length': text_length,
+                'entities_extracted': len(all_entities),
+                'relationships_extracted': len(all_relationships),
+                'merge_stats': merge_stats,
+                'source_file': os.path.basename(pdf_path)
+            })
     
-    except Exception as e:
-        print(f"  ❌ Error processing PDF: {e}")
-        import traceback
-        traceback.print_exc()
-        return None
+    # extractor는 PDF를 한 번에 하나씩만 넘기므로 워커 하나면 충분
+    # (cpu_count개를 띄우면 놀고 있는 인터프리터가 모듈을 매번 다시 import)
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        await asyncio.gather(extractor(executor), llm_worker(), writer())
+    
+    return results
 
 
 async def main_async():
@@ -253,6 +344,9 @@ async def main_async():
         print(f"❌ 데이터 폴더가 없습니다: {data_dir}")
         sys.exit(1)
     
+    # 인덱스/제약조건 (MERGE 전에 생성)
+    ensure_indexes(db)
+    
     # 1. JSON 파일 업로드
     print("\n" + "=" * 70)
     print("📦 1단계: JSON 파일 업로드")
@@ -283,16 +377,27 @@ async def main_async():
         for pdf in pdf_files:
             print(f"  - {pdf.name}")
         
-        pdf_count = 0
-        total_entities = 0
-        total_relationships = 0
+        # 모든 PDF가 공유하는 OpenAI 클라이언트 + RPM/TPM 제한기 + 청크 캐시
+        # (PDF 단계에서만 생성 → 앞 단계에서 종료돼도 클라이언트/캐시 잠금이 새지 않음)
+        from openai import AsyncOpenAI
+        from engine.openai_graph_extractor import ChunkCache, RateLimiter
+        from engine.integrator import DataIntegrator
+        client = AsyncOpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL, max_retries=0)  # 재시도는 _create_with_backoff에서만
+        rate_limiter = RateLimiter(OPENAI_RPM_LIMIT, OPENAI_TPM_LIMIT)
+        # 두 업로드 스크립트가 같은 디스크 캐시를 공유 (같은 청크는 재실행 시에도 재사용)
+        chunk_cache = ChunkCache(CHUNK_CACHE_PATH)
+        # Neo4jDatabase와 같은 드라이버(커넥션 풀)를 공유하는 DataIntegrator
+        integrator = DataIntegrator(driver=db.driver, database=db.database)
+        try:
+            results = await upload_pdfs_pipelined(pdf_files, integrator, client, rate_limiter, chunk_cache)
+        finally:
+            integrator.close()
+            chunk_cache.close()
+            await client.close()
         
-        for pdf_file in pdf_files:
-            result = await upload_pdf_file_with_openai(str(pdf_file), db)
-            if result:
-                pdf_count += 1
-                total_entities += result.get('entities_extracted', 0)
-                total_relationships += result.get('relationships_extracted', 0)
+        pdf_count = len(results)
+        total_entities = sum(r.get('entities_extracted', 0) for r in results)
+        total_relationships = sum(r.get('relationships_extracted', 0) for r in results)
         
         print(f"\n✅ PDF 업로드 완료:")
         print(f"  - 처리된 파일: {pdf_count}/{len(pdf_files)}")
@@ -304,51 +409,21 @@ async def main_async():
     print("📊 3단계: Neo4j 데이터베이스 통계")
     print("=" * 70)
     
-    # 노드 통계
-    stats_query = """
-    MATCH (n)
-    RETURN labels(n)[0] as type, count(n) as count
-    ORDER BY count DESC
-    """
-    
-    stats = db.execute_query(stats_query)
+    # 노드/관계/소스 파일 통계 (한 번의 round-trip)
+    overview = db.get_breakdown_stats(source_limit=10)
     
     print("\n노드 타입별 개수:")
-    total_node_count = 0
-    for record in stats:
-        count = record['count']
-        total_node_count += count
-        print(f"  - {record['type']}: {count:,}")
-    print(f"  📊 총 노드 수: {total_node_count:,}")
-    
-    # 관계 통계
-    rel_query = """
-    MATCH ()-[r]->()
-    RETURN type(r) as type, count(r) as count
-    ORDER BY count DESC
-    """
-    
-    rel_stats = db.execute_query(rel_query)
+    for record in overview['node_stats']:
+        print(f"  - {record['type']}: {record['count']:,}")
+    # 라벨이 여러 개인 노드가 있으므로 라벨별 합 대신 총 개수를 따로 사용
+    print(f"  📊 총 노드 수: {overview['total_nodes']:,}")
     
     print("\n관계 타입별 개수:")
-    total_rel_count = 0
-    for record in rel_stats:
-        count = record['count']
-        total_rel_count += count
-        print(f"  - {record['type']}: {count:,}")
-    print(f"  🔗 총 관계 수: {total_rel_count:,}")
-    
-    # 데이터 소스별 통계
-    source_query = """
-    MATCH (n)
-    WHERE n.source_file IS NOT NULL
-    RETURN n.source_file as source, count(n) as count
-    ORDER BY count DESC
-    LIMIT 10
-    """
-    
-    source_stats = db.execute_query(source_query)
+    for record in overview['rel_stats']:
+        print(f"  - {record['type']}: {record['count']:,}")
+    print(f"  🔗 총 관계 수: {overview['total_rels']:,}")
     
+    source_stats = overview['source_stats']
     if source_stats:
         print("\n소스 파일별 노드 개수 (Top 10):")
         for record in source_stats:
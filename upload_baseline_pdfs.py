@@ -10,8 +10,11 @@ import os
 import sys
 import json
 import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -19,12 +22,122 @@ load_dotenv()
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from db.neo4j_db import Neo4jDatabase
-from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD, OPENAI_API_KEY, OPENAI_BASE_URL
+from config import (
+    NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD, OPENAI_API_KEY, OPENAI_BASE_URL,
+    OPENAI_RPM_LIMIT, OPENAI_TPM_LIMIT
+)
 
+# 청크 추출 결과 디스크 캐시 (upload_all_data.py와 공유)
+CHUNK_CACHE_PATH = str(Path(__file__).parent / '.chunk_cache')
 
-async def process_pdf_to_neo4j(pdf_path: Path, db: Neo4jDatabase):
+# PDF당 처리 한도 (비용 절감), 청크당 ~3000자
+MAX_PAGES = 200
+MAX_CHUNKS = 50
+CHUNK_CHARS = 3000
+# 어차피 버릴 텍스트는 추출하지 않음
+MAX_TEXT_CHARS = MAX_CHUNKS * CHUNK_CHARS
+
+# PDF별 텍스트 비용 추정치 캐시 (mtime이 바뀐 파일만 다시 계산)
+TEXT_COST_CACHE_PATH = Path(__file__).parent / '.pdf_text_cost.json'
+TEXT_COST_SAMPLE_PAGES = 3
+
+# 페이지 단위 텍스트 추출용 프로세스 풀 크기 (풀은 main()에서 생성해 모든 PDF가 공유)
+PAGE_WORKERS = os.cpu_count() or 4
+
+
+def extract_page(pdf_path: str, page_num: int) -> str:
+    """
+    워커 프로세스에서 PDF 한 페이지의 텍스트 추출
+
+    Args:
+        pdf_path: PDF 파일 경로
+        page_num: 0부터 시작하는 페이지 번호
+
+    Returns:
+        페이지 텍스트
+    """
+    import pymupdf
+
+    # 기본 플래그 그대로 사용 (다른 스크립트와 같은 텍스트 → 청크 캐시 공유)
+    with pymupdf.open(pdf_path) as doc:
+        return doc[page_num].get_text()
+
+
+def estimate_text_cost(pdf_path: Path) -> int:
+    """
+    PDF의 추출 텍스트 양 추정 (앞쪽 몇 페이지 평균 글자 수 × 처리할 페이지 수)
+    이미지만 많은 큰 PDF는 파일 크기와 달리 비용이 작게 나와요
+    
+    Args:
+        pdf_path: PDF 파일 경로
+        
+    Returns:
+        추정 글자 수
+    """
+    import pymupdf
+    
+    with pymupdf.open(str(pdf_path)) as doc:
+        page_count = min(len(doc), MAX_PAGES)
+        sample_count = min(page_count, TEXT_COST_SAMPLE_PAGES)
+        if sample_count == 0:
+            return 0
+        sample_chars = sum(len(doc[i].get_text()) for i in range(sample_count))
+    return sample_chars * page_count // sample_count
+
+
+def sort_by_text_cost(pdf_entries):
+    """
+    텍스트 비용 추정치 순으로 정렬 (작은 것부터)
+    추정치는 mtime 기준 사이드카 JSON에 캐시해서 재실행 시 사전 스캔을 건너뛰어요
+    
+    Args:
+        pdf_entries: os.scandir의 PDF DirEntry 목록 (stat 결과가 캐시됨)
+        
+    Returns:
+        정렬된 DirEntry 목록
+    """
+    try:
+        cache = json.loads(TEXT_COST_CACHE_PATH.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        cache = {}
+    
+    costs = {}
+    for entry in pdf_entries:
+        mtime = entry.stat().st_mtime
+        cached = cache.get(entry.name)
+        if cached and cached.get('mtime') == mtime:
+            costs[entry.name] = cached['cost']
+            continue
+        try:
+            cost = estimate_text_cost(Path(entry.path))
+        except Exception as e:
+            # 대체값은 캐시하지 않음 (다음 실행에서 다시 추정)
+            print(f"   ⚠️ {entry.name} 비용 추정 실패, 파일 크기로 대체: {str(e)[:50]}")
+            costs[entry.name] = entry.stat().st_size
+            continue
+        costs[entry.name] = cost
+        cache[entry.name] = {'mtime': mtime, 'cost': cost}
+    
+    try:
+        TEXT_COST_CACHE_PATH.write_text(json.dumps(cache, indent=2), encoding='utf-8')
+    except OSError as e:
+        print(f"   ⚠️ 비용 추정 캐시 저장 실패: {e}")
+    
+    return sorted(pdf_entries, key=lambda e: costs[e.name])
+
+
+async def process_pdf_to_neo4j(pdf_path: Path, integrator, client, rate_limiter, chunk_cache, page_executor, bulk_graphs=None):
     """
     단일 PDF를 처리하여 Neo4j에 저장
+    
+    Args:
+        pdf_path: PDF 파일 경로
+        integrator: 모든 PDF가 공유하는 DataIntegrator
+        client: 모든 PDF가 공유하는 AsyncOpenAI 클라이언트
+        rate_limiter: 모든 PDF가 공유하는 RateLimiter
+        chunk_cache: 모든 PDF가 공유하는 ChunkCache
+        page_executor: 페이지 텍스트 추출용 ProcessPoolExecutor
+        bulk_graphs: --bulk 모드에서 그래프를 모아두는 리스트 (None이면 바로 병합)
     """
     print(f"\n{'='*70}")
     print(f"📄 {pdf_path.name}")
@@ -32,8 +145,7 @@ async def process_pdf_to_neo4j(pdf_path: Path, db: Neo4jDatabase):
     
     try:
         import pymupdf
-        from openai import AsyncOpenAI
-        from engine.integrator import DataIntegrator
+        from engine.openai_graph_extractor import extract_graph_from_chunks, make_chunk_ranges
         
         # 파일 크기 확인
         file_size_kb = pdf_path.stat().st_size / 1024
@@ -43,27 +155,37 @@ async def process_pdf_to_neo4j(pdf_path: Path, db: Neo4jDatabase):
         print(f"   ⏳ 텍스트 추출 중...")
         
         try:
-            doc = pymupdf.open(str(pdf_path))
-            text = ""
-            page_count = len(doc)
+            with pymupdf.open(str(pdf_path)) as doc:
+                page_count = len(doc)
             
             # 페이지 수가 너무 많으면 제한
-            max_pages = 200
-            if page_count > max_pages:
-                print(f"      ⚠️ 페이지 수 제한: {page_count} → {max_pages}")
-                page_count = max_pages
+            if page_count > MAX_PAGES:
+                print(f"      ⚠️ 페이지 수 제한: {page_count} → {MAX_PAGES}")
+                page_count = MAX_PAGES
             
-            for page_num in range(min(page_count, len(doc))):
-                try:
-                    page = doc[page_num]
-                    text += page.get_text()
-                    if (page_num + 1) % 50 == 0:
-                        print(f"      Progress: {page_num + 1}/{page_count} pages")
-                except Exception as page_error:
-                    print(f"      ⚠️ Page {page_num + 1} 에러, 스킵: {str(page_error)[:50]}")
-                    continue
-            
-            doc.close()
+            # 워커 수만큼씩 프로세스 풀에서 병렬 추출 (이벤트 루프는 블로킹되지 않음)
+            # 청크 한도만큼 텍스트가 모이면 나머지 페이지는 건너뜀
+            loop = asyncio.get_running_loop()
+            page_texts = []
+            total_chars = 0
+            for wave_start in range(0, page_count, PAGE_WORKERS):
+                wave = range(wave_start, min(wave_start + PAGE_WORKERS, page_count))
+                wave_texts = await asyncio.gather(
+                    *[loop.run_in_executor(page_executor, extract_page, str(pdf_path), page_num)
+                      for page_num in wave],
+                    return_exceptions=True
+                )
+                for page_num, page_text in zip(wave, wave_texts):
+                    if isinstance(page_text, BaseException):
+                        print(f"      ⚠️ Page {page_num + 1} 에러, 스킵: {str(page_text)[:50]}")
+                        page_text = ""
+                    page_texts.append(page_text)
+                    total_chars += len(page_text)
+                if total_chars >= MAX_TEXT_CHARS:
+                    print(f"      ⚠️ {MAX_TEXT_CHARS:,}자 도달, {len(page_texts)}/{page_count} 페이지에서 추출 중단")
+                    break
+            page_count = len(page_texts)
+            text = "".join(page_texts)
             
         except Exception as extraction_error:
             print(f"   ❌ 텍스트 추출 실패: {str(extraction_error)[:100]}")
@@ -75,79 +197,20 @@ async def process_pdf_to_neo4j(pdf_path: Path, db: Neo4jDatabase):
         
         print(f"   ✅ {len(text):,} 문자 추출 ({page_count} 페이지)")
         
-        # 2. 청크 분할
-        chunk_size = 3000
-        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+        # 2. 청크 분할 (문단 경계를 지키는 토큰 기준 청크, 문자열 대신 (start, end) 오프셋)
+        ranges = make_chunk_ranges(text)
         
         # 대용량 PDF는 청크 수 제한 (비용 절감)
-        max_chunks = 50
-        if len(chunks) > max_chunks:
-            print(f"   ⚠️ 청크 수 제한: {len(chunks)} → {max_chunks} (비용 절감)")
-            chunks = chunks[:max_chunks]
+        if len(ranges) > MAX_CHUNKS:
+            print(f"   ⚠️ 청크 수 제한: {len(ranges)} → {MAX_CHUNKS} (비용 절감)")
+            ranges = ranges[:MAX_CHUNKS]
         
-        print(f"   📦 {len(chunks)}개 청크로 분할")
+        print(f"   📦 {len(ranges)}개 청크로 분할")
         
         # 3. OpenAI로 엔티티 추출
         print(f"   🤖 GPT-4o-mini로 엔티티 추출 중...")
-        client = AsyncOpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL)
-        
-        all_entities = []
-        all_relationships = []
-        
-        for i, chunk in enumerate(chunks, 1):
-            if i % 10 == 0 or i == 1:
-                print(f"      Progress: {i}/{len(chunks)} chunks ({i*100//len(chunks)}%)")
-            
-            prompt = f"""Extract business entities and relationships from this semiconductor/financial text.
-Return ONLY valid JSON format:
-
-{{
-  "entities": [
-    {{"name": "EntityName", "type": "COMPANY|PERSON|PRODUCT|TECHNOLOGY|FINANCIAL_METRIC|LOCATION|REGULATION|RISK", "properties": {{"key": "value"}}}}
-  ],
-  "relationships": [
-    {{"source": "EntityA", "target": "EntityB", "type": "RELATIONSHIP_TYPE", "properties": {{"key": "value"}}}}
-  ]
-}}
-
-Entity types: COMPANY, PERSON, PRODUCT, TECHNOLOGY, FINANCIAL_METRIC, LOCATION, REGULATION, RISK, MARKET, SUPPLY_CHAIN
-Relationship types: SUPPLIES, PURCHASES, COMPETES_WITH, HAS_CEO, EMPLOYS, LOCATED_IN, PRODUCES, IMPACTS, DEPENDS_ON, REGULATES
-
-Text:
-{chunk}
-
-JSON output:"""
-            
-            try:
-                response = await client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {"role": "system", "content": "You are a financial document analyzer. Extract structured entities and relationships. Respond with valid JSON only."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.1,
-                    max_tokens=2000,
-                    timeout=30
-                )
-                
-                content = response.choices[0].message.content.strip()
-                
-                # JSON 파싱
-                if content.startswith("```json"):
-                    content = content[7:]
-                if content.startswith("```"):
-                    content = content[3:]
-                if content.endswith("```"):
-                    content = content[:-3]
-                content = content.strip()
-                
-                extracted = json.loads(content)
-                all_entities.extend(extracted.get("entities", []))
-                all_relationships.extend(extracted.get("relationships", []))
-                
-            except Exception as e:
-                print(f"      ⚠️ Chunk {i} 실패: {str(e)[:50]}")
-                continue
+        # 청크들을 동시에 요청 (Semaphore로 동시 요청 수 제한)
+        all_entities, all_relationships = await extract_graph_from_chunks(client, text, ranges, rate_limiter, chunk_cache)
         
         print(f"   ✅ 총 {len(all_entities)} 엔티티, {len(all_relationships)} 관계 추출")
         
@@ -157,20 +220,30 @@ JSON output:"""
             for ent in all_entities[:5]:
                 print(f"      - {ent.get('name')} ({ent.get('type')})")
         
-        # 4. Neo4j에 저장
-        print(f"   💾 Neo4j에 저장 중...")
-        integrator = DataIntegrator()
         graph_data = {
             "entities": all_entities,
             "relationships": all_relationships
         }
         
+        # --bulk 모드: 모든 PDF 추출이 끝난 뒤 CSV + LOAD CSV로 한 번에 적재
+        if bulk_graphs is not None:
+            bulk_graphs.append((graph_data, pdf_path.name, pdf_path.stem))
+            print("   📥 벌크 적재 대기열에 추가")
+            return {
+                'file': pdf_path.name,
+                'text_length': len(text),
+                'entities': len(all_entities),
+                'relationships': len(all_relationships),
+                'merged': None
+            }
+        
+        # 4. Neo4j에 저장
+        print(f"   💾 Neo4j에 저장 중...")
         merge_stats = integrator.ingestPdfGraph(
             graphData=graph_data,
             sourceFile=pdf_path.name,
             sourceLabel=pdf_path.stem
         )
-        integrator.close()
         
         print(f"   ✅ Neo4j 저장 완료:")
         print(f"      - 병합된 엔티티: {merge_stats.get('entitiesMerged', 0):,}")
@@ -191,8 +264,14 @@ JSON output:"""
         return None
 
 
-async def main():
-    """메인 함수"""
+async def main(bulk: bool = False, import_dir: Optional[str] = None):
+    """
+    메인 함수
+    
+    Args:
+        bulk: True면 PDF별 MERGE 대신 마지막에 CSV + LOAD CSV로 일괄 적재 (빈 DB 초기 적재용)
+        import_dir: --bulk CSV를 쓸 Neo4j 서버 import 디렉토리
+    """
     start_time = datetime.now()
     
     print("=" * 70)
@@ -209,34 +288,76 @@ async def main():
         print("❌ OpenAI API 키가 없습니다. .env 파일을 확인하세요.")
         sys.exit(1)
     
+    # --bulk: CSV는 모든 추출이 끝난 뒤에 쓰므로, 긴 추출 전에 import 디렉토리부터 확인
+    if bulk:
+        if not import_dir:
+            print("❌ --bulk에는 --import-dir 또는 NEO4J_IMPORT_DIR가 필요합니다 (Neo4j 서버의 import 디렉토리).")
+            sys.exit(1)
+        if not os.path.isdir(import_dir):
+            print(f"❌ import 디렉토리가 없습니다: {import_dir}")
+            sys.exit(1)
+        if not os.access(import_dir, os.W_OK):
+            print(f"❌ import 디렉토리에 쓰기 권한이 없습니다: {import_dir}")
+            sys.exit(1)
+    
     # Neo4j 연결
     db = Neo4jDatabase(NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD)
     print(f"✅ Neo4j 연결 성공: {NEO4J_URI}")
     
-    # PDF 파일 목록 (크기 순으로 정렬 - 작은 것부터)
+    # PDF 파일 목록 (추출 텍스트 비용 추정치 순으로 정렬 - 작은 것부터)
+    # os.scandir의 DirEntry는 stat 결과를 캐시해서 파일마다 stat을 다시 부르지 않아요
     data_dir = Path(__file__).parent / 'data' / 'baseline'
-    pdf_files = sorted(data_dir.glob('*.pdf'), key=lambda p: p.stat().st_size)
+    pdf_entries = []
+    if data_dir.is_dir():
+        with os.scandir(data_dir) as it:
+            pdf_entries = [e for e in it if e.name.endswith('.pdf') and e.is_file()]
+        pdf_entries = sort_by_text_cost(pdf_entries)
     
-    if not pdf_files:
+    if not pdf_entries:
         print("❌ PDF 파일이 없습니다.")
         sys.exit(1)
     
-    print(f"\n📚 발견된 PDF 파일: {len(pdf_files)}개")
-    for i, pdf in enumerate(pdf_files, 1):
-        size_kb = pdf.stat().st_size / 1024
-        print(f"   {i}. {pdf.name} ({size_kb:.1f} KB)")
+    print(f"\n📚 발견된 PDF 파일: {len(pdf_entries)}개")
+    for i, entry in enumerate(pdf_entries, 1):
+        size_kb = entry.stat().st_size / 1024
+        print(f"   {i}. {entry.name} ({size_kb:.1f} KB)")
+    pdf_files = [Path(entry.path) for entry in pdf_entries]
+    
+    # 모든 PDF가 공유하는 OpenAI 클라이언트 + RPM/TPM 제한기 + 청크 캐시
+    from openai import AsyncOpenAI
+    from engine.openai_graph_extractor import ChunkCache, RateLimiter
+    client = AsyncOpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL, max_retries=0)  # 재시도는 _create_with_backoff에서만
+    rate_limiter = RateLimiter(OPENAI_RPM_LIMIT, OPENAI_TPM_LIMIT)
+    # 두 업로드 스크립트가 같은 디스크 캐시를 공유 (같은 청크는 재실행 시에도 재사용)
+    chunk_cache = ChunkCache(CHUNK_CACHE_PATH)
     
-    # 각 PDF 처리
+    # 각 PDF 처리 (Neo4jDatabase와 같은 드라이버를 공유하는 DataIntegrator 하나로)
+    from engine.integrator import DataIntegrator
+    integrator = DataIntegrator(driver=db.driver, database=db.database)
     results = []
+    bulk_graphs = [] if bulk else None
     
-    for i, pdf_file in enumerate(pdf_files, 1):
-        print(f"\n\n{'='*70}")
-        print(f"진행 상황: {i}/{len(pdf_files)} ({i*100//len(pdf_files)}%)")
-        print(f"{'='*70}")
+    try:
+        with ProcessPoolExecutor(max_workers=PAGE_WORKERS) as page_executor:
+            for i, pdf_file in enumerate(pdf_files, 1):
+                print(f"\n\n{'='*70}")
+                print(f"진행 상황: {i}/{len(pdf_files)} ({i*100//len(pdf_files)}%)")
+                print(f"{'='*70}")
+                
+                result = await process_pdf_to_neo4j(
+                    pdf_file, integrator, client, rate_limiter, chunk_cache, page_executor, bulk_graphs
+                )
+                if result:
+                    results.append(result)
         
-        result = await process_pdf_to_neo4j(pdf_file, db)
-        if result:
-            results.append(result)
+        if bulk_graphs:
+            print(f"\n📥 벌크 적재: {len(bulk_graphs)}개 PDF → {import_dir} CSV → LOAD CSV")
+            bulk_stats = integrator.bulkIngestPdfGraphs(bulk_graphs, import_dir)
+            print(f"   ✅ 엔티티 {bulk_stats['entitiesMerged']:,}, 관계 {bulk_stats['relationshipsCreated']:,} 적재 완료")
+    finally:
+        integrator.close()
+        chunk_cache.close()
+        await client.close()
     
     # 최종 통계
     print(f"\n\n{'='*70}")
@@ -255,35 +376,21 @@ async def main():
     # Neo4j 데이터베이스 통계
     print(f"\n📈 Neo4j 데이터베이스 통계:")
     
-    # 노드 타입별
-    node_stats = db.execute_query("""
-        MATCH (n)
-        RETURN labels(n)[0] as type, count(n) as count
-        ORDER BY count DESC
-        LIMIT 10
-    """)
+    # 노드/관계 타입별 (한 번의 round-trip, 소스 파일 통계는 생략)
+    overview = db.get_breakdown_stats(source_limit=0)
+    node_stats = overview['node_stats']
+    rel_stats = overview['rel_stats']
+    # 라벨이 여러 개인 노드가 있으므로 라벨별 합 대신 총 개수를 따로 사용
+    total_nodes = overview['total_nodes']
+    total_rels = overview['total_rels']
     
     print(f"\n   노드 타입 (Top 10):")
-    total_nodes = 0
-    for record in node_stats:
-        count = record['count']
-        total_nodes += count
-        print(f"   - {record['type']}: {count:,}")
-    
-    # 관계 타입별
-    rel_stats = db.execute_query("""
-        MATCH ()-[r]->()
-        RETURN type(r) as type, count(r) as count
-        ORDER BY count DESC
-        LIMIT 10
-    """)
+    for record in node_stats[:10]:
+        print(f"   - {record['type']}: {record['count']:,}")
     
     print(f"\n   관계 타입 (Top 10):")
-    total_rels = 0
-    for record in rel_stats:
-        count = record['count']
-        total_rels += count
-        print(f"   - {record['type']}: {count:,}")
+    for record in rel_stats[:10]:
+        print(f"   - {record['type']}: {record['count']:,}")
     
     print(f"\n   📊 총 노드 수: {total_nodes:,}")
     print(f"   🔗 총 관계 수: {total_rels:,}")
@@ -305,4 +412,17 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Baseline PDF 파일들을 Neo4j에 영구 저장")
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="PDF별 MERGE 대신 CSV + LOAD CSV ... IN TRANSACTIONS로 일괄 적재 (빈 DB 초기 적재용)"
+    )
+    parser.add_argument(
+        "--import-dir",
+        default=os.getenv("NEO4J_IMPORT_DIR"),
+        help="Neo4j 서버가 file:/// 로 읽는 import 디렉토리 (--bulk에 필수, 기본값: $NEO4J_IMPORT_DIR)"
+    )
+    args = parser.parse_args()
+    
+    asyncio.run(main(bulk=args.bulk, import_dir=args.import_dir))